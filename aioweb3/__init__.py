@@ -23,10 +23,12 @@ from .types import (
     BlockData,
     BlockParameter,
     EventTopic,
+    FullBlockData,
     LogData,
     TopicsFilter,
     TxParams,
     TxReceipt,
     Wei,
 )
+from .utils import event_topic, function_selector, function_signature
 from .web3mixin import UseWeb3, Web3Mixin, set_default_web3
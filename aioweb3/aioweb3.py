@@ -1,13 +1,13 @@
 import asyncio
 import logging
 import typing
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import eth_abi
-from eth_hash.auto import keccak
-from hexbytes import HexBytes
 
 from .endpoints import RPCMethod
+from .event import EventParser, ParsedEvent
+from .exceptions import Web3TimeoutError
 from .methodcall import MethodCallParams
 from .transport import BaseTransport, Subscription, get_transport
 from .types import (
@@ -17,6 +17,7 @@ from .types import (
     BlockParameter,
     CallStateOverrideParams,
     FilterId,
+    FullBlockData,
     LogData,
     SignedTransaction,
     TopicsFilter,
@@ -26,6 +27,7 @@ from .types import (
     TxReceipt,
     Wei,
 )
+from .utils import function_selector, function_signature, hex_to_bytes
 
 
 def _format_block_parameter(block_parameter: Optional[BlockParameter]) -> Optional[str]:
@@ -39,17 +41,46 @@ def _format_params(params: typing.Mapping[str, Any]) -> Dict[str, Any]:
     return {k: hex(v) if isinstance(v, int) else v for k, v in params.items()}
 
 
+def _format_filter_params(
+    from_block: Optional[BlockParameter],
+    to_block: Optional[BlockParameter],
+    address: Optional[AddressFilter],
+    topics: Optional[TopicsFilter],
+    blockhash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the filter object of eth_newFilter / eth_getLogs, leaving out unset fields"""
+    params: Dict[str, Any] = {}
+    if from_block is not None:
+        params["fromBlock"] = _format_block_parameter(from_block)
+    if to_block is not None:
+        params["toBlock"] = _format_block_parameter(to_block)
+    if address is not None:
+        params["address"] = address
+    if topics is not None:
+        params["topics"] = topics
+    if blockhash is not None:
+        params["blockhash"] = blockhash
+    return params
+
+
 class AioWeb3:
     """Main interface for interacting with the Web3 server"""
 
-    def __init__(self, transport: Union[BaseTransport, str]):
+    def __init__(self, transport: Union[BaseTransport, str], chain_id: Optional[int] = None):
+        """
+        Args:
+            transport: the transport, or the URI of the Web3 server
+            chain_id: the chain ID of the network, if known in advance; saves the eth_chainId
+                request otherwise sent on first use (optional)
+        """
         self.logger = logging.getLogger(__name__)
         self._transport: BaseTransport
         if isinstance(transport, str):
             self._transport = get_transport(transport)
         else:
             self._transport = transport
-        self._chain_id: Optional[int] = None
+        self._chain_id: Optional[int] = chain_id
+        self._chain_id_task: Optional[asyncio.Task[int]] = None
 
     def __repr__(self) -> str:
         return f"<AioWeb3: {self._transport.uri}>"
@@ -59,6 +90,13 @@ class AioWeb3:
         ret = await self._transport.send_request(method, params)
         return ret
 
+    async def send_batch(self, calls: Sequence[Tuple[str, Any]]) -> List[Any]:
+        """Send multiple requests as a single JSON-RPC batch
+
+        `calls` is a sequence of (method, params) pairs. Results are returned in the same order.
+        """
+        return await self._transport.send_batch(calls)
+
     async def subscribe(self, params: Any) -> Subscription:
         """Subscribe to streaming updates from Web3"""
         return await self._transport.subscribe(params)
@@ -89,11 +127,29 @@ class AioWeb3:
 
     @property
     async def chain_id(self) -> int:
+        """The chain ID of the connected network
+
+        The chain ID never changes, so it is fetched only once (or never, if given to the
+        constructor). Concurrent callers share the same in-flight request.
+        """
         if self._chain_id is None:
-            id_hex = await self.send_request(RPCMethod.eth_chainId)
-            self._chain_id = int(id_hex, 16)
+            if self._chain_id_task is None:
+                self._chain_id_task = asyncio.create_task(self._fetch_chain_id())
+            try:
+                # shield the shared task, so that one cancelled caller does not cancel the others
+                chain_id: int = await asyncio.shield(self._chain_id_task)
+            except Exception:
+                # allow the next caller to retry
+                self._chain_id_task = None
+                raise
+            self._chain_id = chain_id
+            return chain_id
         return self._chain_id
 
+    async def _fetch_chain_id(self) -> int:
+        id_hex = await self.send_request(RPCMethod.eth_chainId)
+        return int(id_hex, 16)
+
     @property
     async def accounts(self):
         return await self.send_request(RPCMethod.eth_accounts)
@@ -108,6 +164,20 @@ class AioWeb3:
         hex_price = await self.send_request(RPCMethod.eth_gasPrice)
         return int(hex_price, 16)
 
+    async def get_tx_context(self, address: Address) -> Dict[str, int]:
+        """Get what is typically needed before sending a transaction from `address`
+
+        Returns a dict with "balance", "nonce" (pending transaction count), "gasPrice" and "chainId".
+        The requests are sent concurrently.
+        """
+        balance, nonce, gas_price, chain_id = await asyncio.gather(
+            self.get_balance(address),
+            self.get_transaction_count(address, "pending"),
+            self.gas_price,
+            self.chain_id,
+        )
+        return {"balance": balance, "nonce": nonce, "gasPrice": gas_price, "chainId": chain_id}
+
     async def get_transaction_count(
         self, address: Address, block: BlockParameter = "latest"
     ) -> int:
@@ -126,13 +196,11 @@ class AioWeb3:
         block: BlockParameter = "latest",
         **kwargs,
     ):
-        function_signature = method_name + "(" + ",".join(input_types) + ")"
-        function_selector = "0x" + keccak(function_signature.encode()).hex()[:8]
-        input_data = eth_abi.encode_abi(input_types, args).hex()
-        data = function_selector + input_data
+        selector = function_selector(function_signature(method_name, input_types))
+        data = selector + eth_abi.encode_abi(input_types, args).hex()
         params = TxParams(to=to, data=data)
         output_data = await self._call(params, block=block, **kwargs)
-        output = eth_abi.decode_abi(output_types, bytes(HexBytes(output_data)))
+        output = eth_abi.decode_abi(output_types, hex_to_bytes(output_data))
         if len(output) == 1:
             return output[0]
         else:
@@ -162,7 +230,7 @@ class AioWeb3:
         """
         res = await self.send_request(RPCMethod.eth_getTransactionByHash, [tx_hash])
         if res:
-            return TxData(**res)
+            return TxData.from_rpc(res)
         else:
             return None
 
@@ -175,18 +243,41 @@ class AioWeb3:
         """
         res = await self.send_request(RPCMethod.eth_getTransactionReceipt, [tx_hash])
         if res:
-            return TxReceipt(**res)
+            return TxReceipt.from_rpc(res)
         else:
             return None
 
     async def wait_for_transaction_receipt(
-        self, tx_hash: TxHash, poll_interval: float = 3
+        self,
+        tx_hash: TxHash,
+        initial_interval: float = 0.5,
+        max_interval: float = 3.0,
+        timeout: Optional[float] = None,
     ) -> TxReceipt:
+        """Poll for the receipt of a transaction until it is available
+
+        Polling starts every `initial_interval` seconds and backs off exponentially up to every
+        `max_interval` seconds, so that fast transactions are noticed quickly without hammering the
+        server for slow ones.
+
+        Raises Web3TimeoutError if no receipt is found within `timeout` seconds. Waits indefinitely
+        if `timeout` is None.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        interval = initial_interval
         while True:
             receipt = await self.get_transaction_receipt(tx_hash)
             if receipt is not None:
                 return receipt
-            await asyncio.sleep(poll_interval)
+            if deadline is None:
+                await asyncio.sleep(interval)
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise Web3TimeoutError(f"Timeout after {timeout} seconds for receipt {tx_hash}")
+                await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, max_interval)
 
     async def call(
         self, method_call_params: MethodCallParams, block: BlockParameter = "latest", **kwargs
@@ -198,11 +289,31 @@ class AioWeb3:
         else:
             return ret
 
+    async def call_many(
+        self, method_call_params: Sequence[MethodCallParams], block: BlockParameter = "latest"
+    ) -> List[Any]:
+        """Make multiple contract calls in a single JSON-RPC batch
+
+        Returns the decoded outputs in the same order as `method_call_params`.
+        """
+        formatted_block = _format_block_parameter(block)
+        outputs = await self.send_batch(
+            [
+                (RPCMethod.eth_call, [_format_params(params.tx_params), formatted_block])
+                for params in method_call_params
+            ]
+        )
+        ret = []
+        for params, data in zip(method_call_params, outputs):
+            decoded = params.method_call.decode_output(data)
+            ret.append(decoded[0] if len(decoded) == 1 else decoded)
+        return ret
+
     async def _call(
         self,
         params: TxParams,
         block: BlockParameter = "latest",
-        state_override: CallStateOverrideParams = {},
+        state_override: Optional[CallStateOverrideParams] = None,
     ) -> str:
         """
         https://eth.wiki/json-rpc/API#eth_call
@@ -210,14 +321,10 @@ class AioWeb3:
 
         Return raw string output (not decoded)
         """
-        return await self.send_request(
-            RPCMethod.eth_call,
-            [
-                _format_params(params),
-                _format_block_parameter(block),
-                _format_params(state_override),
-            ],
-        )
+        rpc_params = [_format_params(params), _format_block_parameter(block)]
+        if state_override:
+            rpc_params.append(_format_params(state_override))
+        return await self.send_request(RPCMethod.eth_call, rpc_params)
 
     async def estimate_gas(self, params: TxParams, block: BlockParameter = "latest") -> Wei:
         qty = await self.send_request(
@@ -235,27 +342,50 @@ class AioWeb3:
         )
         return Wei(int(b, 16))
 
-    async def get_block_by_number(
-        self, block: BlockParameter = "latest"
-    ) -> Optional[BlockData[TxHash]]:
+    async def get_balances(
+        self, addresses: Sequence[Address], block: BlockParameter = "latest"
+    ) -> List[Wei]:
+        """Get the balances of multiple addresses in a single JSON-RPC batch"""
+        formatted_block = _format_block_parameter(block)
+        res = await self.send_batch(
+            [(RPCMethod.eth_getBalance, [address, formatted_block]) for address in addresses]
+        )
+        return [Wei(int(b, 16)) for b in res]
+
+    async def get_transaction_count_and_receipts(
+        self, address: Address, tx_hashes: Sequence[TxHash]
+    ) -> Tuple[int, List[Optional[TxReceipt]]]:
+        """Get the latest transaction count of an address and the receipts of transactions in a
+        single JSON-RPC batch
+
+        Receipts are `None` for transactions that are not mined yet.
+        """
+        res = await self.send_batch(
+            [(RPCMethod.eth_getTransactionCount, [address, "latest"])]
+            + [(RPCMethod.eth_getTransactionReceipt, [tx_hash]) for tx_hash in tx_hashes]
+        )
+        receipts = [TxReceipt.from_rpc(r) if r else None for r in res[1:]]
+        return int(res[0], 16), receipts
+
+    async def get_block_by_number(self, block: BlockParameter = "latest") -> Optional[BlockData]:
         full_transactions = False
         res = await self.send_request(
             RPCMethod.eth_getBlockByNumber, [_format_block_parameter(block), full_transactions]
         )
         if res is not None:
-            return BlockData[TxHash](**res)
+            return BlockData(**res)
         else:
             return None
 
     async def get_full_block_by_number(
         self, block: BlockParameter = "latest"
-    ) -> Optional[BlockData[TxData]]:
+    ) -> Optional[FullBlockData]:
         full_transactions = True
         res = await self.send_request(
             RPCMethod.eth_getBlockByNumber, [_format_block_parameter(block), full_transactions]
         )
         if res is not None:
-            return BlockData[TxData](**res)
+            return FullBlockData(**res)
         else:
             return None
 
@@ -269,13 +399,7 @@ class AioWeb3:
         """
         https://eth.wiki/json-rpc/API#eth_newFilter
         """
-        params = {
-            "fromBlock": _format_block_parameter(from_block),
-            "toBlock": _format_block_parameter(to_block),
-            "address": address,
-            "topics": topics,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
+        params = _format_filter_params(from_block, to_block, address, topics)
         filter_id = await self.send_request(RPCMethod.eth_newFilter, [params])
         return FilterId(int(filter_id, 16))
 
@@ -293,12 +417,12 @@ class AioWeb3:
     async def get_filter_logs(self, filter_id: FilterId) -> List[LogData]:
         # TODO: handle new block & pending transaction filters
         res = await self.send_request(RPCMethod.eth_getFilterLogs, [hex(filter_id)])
-        return [LogData(**log_data) for log_data in res]
+        return LogData.from_many(res)
 
     async def get_filter_changes(self, filter_id: FilterId) -> List[LogData]:
         # TODO: handle new block & pending transaction filters
         res = await self.send_request(RPCMethod.eth_getFilterChanges, [hex(filter_id)])
-        return [LogData(**log_data) for log_data in res]
+        return LogData.from_many(res)
 
     async def get_logs(
         self,
@@ -312,16 +436,36 @@ class AioWeb3:
 
         https://eth.wiki/json-rpc/API#eth_getlogs
         """
-        params = {
-            "fromBlock": _format_block_parameter(from_block),
-            "toBlock": _format_block_parameter(to_block),
-            "address": address,
-            "topics": topics,
-            "blockhash": blockhash,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
-        res = await self.send_request(RPCMethod.eth_getLogs, [params])
-        return [LogData(**log_data) for log_data in res]
+        res = await self._get_raw_logs(from_block, to_block, address, topics, blockhash)
+        return LogData.from_many(res)
+
+    async def get_parsed_logs(
+        self,
+        event_parser: EventParser,
+        from_block: Optional[BlockParameter] = None,
+        to_block: Optional[BlockParameter] = None,
+        address: Optional[AddressFilter] = None,
+        topics: Optional[TopicsFilter] = None,
+        blockhash: Optional[str] = None,
+    ) -> List[ParsedEvent]:
+        """Get event logs and parse them with `event_parser`
+
+        Logs not matching any of the parser's event specs are skipped before being converted into
+        LogData, which makes this cheaper than `get_logs` followed by `EventParser.parse_logs`.
+        """
+        res = await self._get_raw_logs(from_block, to_block, address, topics, blockhash)
+        return list(event_parser.parse_logs_raw(res))
+
+    async def _get_raw_logs(
+        self,
+        from_block: Optional[BlockParameter] = None,
+        to_block: Optional[BlockParameter] = None,
+        address: Optional[AddressFilter] = None,
+        topics: Optional[TopicsFilter] = None,
+        blockhash: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        params = _format_filter_params(from_block, to_block, address, topics, blockhash)
+        return await self.send_request(RPCMethod.eth_getLogs, [params])
 
     async def subscribe_block(self) -> Subscription:
         return await self.subscribe(["newHeads"])
@@ -2,7 +2,11 @@
 
 
 class RPCMethod:
-    """A placeholder for various Web3 RPC methods"""
+    """A placeholder for various Web3 RPC methods
+
+    The values are plain `str` on purpose: they are passed as-is to the JSON encoder, and CPython
+    already interns identifier-like string literals such as these.
+    """
 
     web3_clientVersion = "web3_clientVersion"
 
@@ -1,11 +1,112 @@
+import functools
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 import eth_abi
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
 from eth_hash.auto import keccak
-from hexbytes import HexBytes
 
-from .types import EventTopic, LogData
+from .types import EventTopic, LogData, TopicsFilter
+from .utils import (
+    BYTES_TYPE_RE,
+    INT_TYPE_RE,
+    event_topic,
+    function_signature,
+    hex_to_bytes,
+)
+
+WordDecoder = Callable[[bytes], Any]
+
+
+def _make_word_decoder(type_str: str) -> Optional[WordDecoder]:
+    """Return a specialized decoder for a single 32-byte ABI word
+
+    Only value types that occupy exactly one word (uintN, intN, address, bool, bytesN) are
+    supported; returns None for all other types. The decoders check the padding the same way
+    eth_abi does, and return the same values.
+    """
+    match = INT_TYPE_RE.fullmatch(type_str)
+    if match:
+        signed = not match.group(1)
+        bits = int(match.group(2) or 256)
+        if signed:
+            low, high = -(1 << (bits - 1)), 1 << (bits - 1)
+        else:
+            low, high = 0, 1 << bits
+
+        def decode_int(word: bytes) -> int:
+            value = int.from_bytes(word, "big", signed=signed)
+            if not low <= value < high:
+                raise ValueError(f"Value {value} out of range for {type_str}")
+            return value
+
+        return decode_int
+    if type_str == "address":
+
+        def decode_address(word: bytes) -> str:
+            if word[:12] != b"\x00" * 12:
+                raise ValueError(f"Non-empty padding bytes for address: {word.hex()}")
+            return "0x" + word[12:].hex()
+
+        return decode_address
+    if type_str == "bool":
+
+        def decode_bool(word: bytes) -> bool:
+            value = int.from_bytes(word, "big")
+            if value > 1:
+                raise ValueError(f"Invalid value {value} for bool")
+            return bool(value)
+
+        return decode_bool
+    match = BYTES_TYPE_RE.fullmatch(type_str)
+    if match and 1 <= int(match.group(1)) <= 32:
+        size = int(match.group(1))
+
+        def decode_bytes(word: bytes) -> bytes:
+            if word[size:] != b"\x00" * (32 - size):
+                raise ValueError(f"Non-empty padding bytes for {type_str}: {word.hex()}")
+            return word[:size]
+
+        return decode_bytes
+    return None
+
+
+def _encode_topic(type_str: str, value: Any) -> EventTopic:
+    """Encode the value of an indexed event field into a topic
+
+    Dynamic types (string and bytes) are indexed by the keccak hash of their value.
+    """
+    if isinstance(value, (bytearray, memoryview)):
+        value = bytes(value)
+    try:
+        hash(value)
+    except TypeError:
+        return _encode_topic_uncached(type_str, value)
+    return _encode_topic_cached(type_str, value)
+
+
+def _encode_topic_uncached(type_str: str, value: Any) -> EventTopic:
+    if type_str == "string":
+        return EventTopic("0x" + keccak(value.encode()).hex())
+    if type_str == "bytes":
+        return EventTopic("0x" + keccak(value).hex())
+    if _make_word_decoder(type_str) is None:
+        raise ValueError(f"Encoding indexed field of type {type_str} is not supported")
+    return EventTopic("0x" + eth_abi.encode_single(type_str, value).hex())
+
+
+# typed, so that e.g. True and 1 (which are equal, and hash alike) are encoded separately
+_encode_topic_cached = functools.lru_cache(maxsize=4096, typed=True)(_encode_topic_uncached)
+
+
+def _make_abi_decoder(type_str: str) -> WordDecoder:
+    """Return a decoder for `type_str`, using a specialized word decoder when possible"""
+    word_decoder = _make_word_decoder(type_str)
+    if word_decoder is not None:
+        return word_decoder
+    decoder = registry.get_decoder(type_str)
+    return lambda data: decoder(ContextFramesBytesIO(data))
 
 
 @dataclass
@@ -20,13 +121,27 @@ class EventSpec:
         self.event_name = event_name
         self.fields = fields
 
-        self.signature: str = event_name + "(" + ",".join(f.type for f in fields) + ")"
-        self.signature_hash: EventTopic = EventTopic("0x" + keccak(self.signature.encode()).hex())
+        self.signature: str = function_signature(event_name, (f.type for f in fields))
+        self.signature_hash: EventTopic = EventTopic(event_topic(self.signature))
+        # topics filter matching all logs of this event, e.g. for `AioWeb3.get_logs`
+        self.topic_filter: TopicsFilter = [self.signature_hash]
 
         self._indexed_fields = [(f.name, f.type) for f in fields if f.indexed]
         self._non_indexed_field_names = [f.name for f in fields if not f.indexed]
         self._non_indexed_field_types = [f.type for f in fields if not f.indexed]
 
+        # look up the ABI decoders once, instead of parsing the type strings for every log
+        self._indexed_decoders = [(f.name, _make_abi_decoder(f.type)) for f in fields if f.indexed]
+        self._non_indexed_decoder = registry.get_decoder(
+            "(" + ",".join(self._non_indexed_field_types) + ")"
+        )
+        # most events (e.g. Transfer, Swap, Sync) only have one-word value types in their data, which
+        # can be decoded word by word without going through eth_abi
+        word_decoders = [_make_word_decoder(type_) for type_ in self._non_indexed_field_types]
+        self._non_indexed_word_decoders: Optional[List[WordDecoder]] = (
+            word_decoders if all(word_decoders) else None  # type: ignore
+        )
+
     def __repr__(self):
         return f"<EventSpec: {self.signature}>"
 
@@ -37,25 +152,70 @@ class EventSpec:
         """
         return self.signature_hash
 
+    def make_topics(self, **indexed_values: Any) -> TopicsFilter:
+        """Return a topics filter matching this event with the given indexed field values
+
+        Each keyword argument is the name of an indexed field, and its value (or a list of values,
+        any of which matches). Fields not given match any value. For example:
+
+            ERC20.Transfer.make_topics(to=my_address)
+        """
+        unknown = indexed_values.keys() - {name for name, _ in self._indexed_fields}
+        if unknown:
+            raise ValueError(f"{sorted(unknown)} are not indexed fields of {self}")
+        topics: TopicsFilter = [self.signature_hash]
+        for name, type_ in self._indexed_fields:
+            value = indexed_values.get(name)
+            if value is None:
+                topics.append(None)
+            elif isinstance(value, list):
+                topics.append([_encode_topic(type_, v) for v in value])
+            else:
+                topics.append(_encode_topic(type_, value))
+        # trailing wildcards are implied
+        while topics[-1] is None:
+            topics.pop()
+        return topics
+
     @property
     def num_indexed_fields(self):
         return len(self._indexed_fields)
 
     def parse_log(self, log: LogData) -> Dict[str, Any]:
-        ret: Dict[str, Any] = {}
         try:
-            # verify signature hash
-            assert log.topics[0] == self.signature_hash
-            # parse indexed fields
-            assert len(self._indexed_fields) + 1 == len(log.topics)
-            for idx, (name, type_) in enumerate(self._indexed_fields):
-                parsed = eth_abi.decode_abi([type_], bytes(HexBytes(log.topics[idx + 1])))[0]
-                ret[name] = parsed
-            # parse non-indexed fields
-            parsed = eth_abi.decode_abi(self._non_indexed_field_types, bytes(HexBytes(log.data)))
-            ret.update(zip(self._non_indexed_field_names, parsed))
+            return self._parse_fields(log.topics, log.data)
         except Exception as exc:
             raise ValueError(f"Failed to parse log {log} using parser {self}") from exc
+
+    def parse_log_raw(self, topics: Sequence[str], data: str) -> Dict[str, Any]:
+        """Same as `parse_log`, but takes the "topics" and "data" fields of a raw JSON-RPC log"""
+        try:
+            return self._parse_fields(topics, data)
+        except Exception as exc:
+            raise ValueError(
+                f"Failed to parse log (topics={topics}, data={data}) using parser {self}"
+            ) from exc
+
+    def _parse_fields(self, topics: Sequence[str], data: str) -> Dict[str, Any]:
+        ret: Dict[str, Any] = {}
+        # verify signature hash
+        assert topics[0] == self.signature_hash
+        # parse indexed fields
+        assert len(self._indexed_decoders) + 1 == len(topics)
+        for (name, decoder), topic in zip(self._indexed_decoders, topics[1:]):
+            ret[name] = decoder(hex_to_bytes(topic))
+        # parse non-indexed fields
+        data_bytes = hex_to_bytes(data)
+        if self._non_indexed_word_decoders is not None:
+            word_decoders = self._non_indexed_word_decoders
+            if len(data_bytes) < 32 * len(word_decoders):
+                raise ValueError(f"Insufficient data for {self._non_indexed_field_types}")
+            parsed = [
+                decoder(data_bytes[32 * i : 32 * i + 32]) for i, decoder in enumerate(word_decoders)
+            ]
+        else:
+            parsed = self._non_indexed_decoder(ContextFramesBytesIO(data_bytes))
+        ret.update(zip(self._non_indexed_field_names, parsed))
         return ret
 
 
@@ -78,3 +238,18 @@ class EventParser:
             if event_spec and 1 + event_spec.num_indexed_fields == len(log.topics):
                 fields = event_spec.parse_log(log)
                 yield ParsedEvent(event_spec, fields, log)
+
+    def parse_logs_raw(self, logs: Iterable[Dict[str, Any]]) -> Iterable[ParsedEvent]:
+        """Same as `parse_logs`, but takes raw JSON-RPC logs (e.g. the result of eth_getLogs)
+
+        Only the logs matching one of the event specs are converted into LogData, which saves the
+        cost of building LogData for logs that would be skipped anyway.
+        """
+        for log in logs:
+            topics = log["topics"]
+            if not topics:
+                continue
+            event_spec = self.event_specs.get(EventTopic(topics[0]))
+            if event_spec and 1 + event_spec.num_indexed_fields == len(topics):
+                fields = event_spec.parse_log_raw(topics, log["data"])
+                yield ParsedEvent(event_spec, fields, LogData.from_rpc(log))
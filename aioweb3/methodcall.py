@@ -1,11 +1,89 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence
 
-import eth_abi
-from eth_hash.auto import keccak
-from hexbytes import HexBytes
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
 
 from .types import Address, TxParams
+from .utils import (
+    BYTES_TYPE_RE,
+    INT_TYPE_RE,
+    function_selector,
+    function_signature,
+    hex_to_bytes,
+)
+
+# Encodes a value into a single 32-byte ABI word. Returns None if the value is not handled by the
+# fast path, in which case we fall back to eth_abi (which also takes care of raising the errors).
+WordEncoder = Callable[[Any], Optional[bytes]]
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def _make_word_encoder(type_str: str) -> Optional[WordEncoder]:
+    """Return a specialized encoder for a one-word ABI value type (uintN, intN, address, bool,
+    bytesN), or None for all other types"""
+    match = INT_TYPE_RE.fullmatch(type_str)
+    if match:
+        signed = not match.group(1)
+        bits = int(match.group(2) or 256)
+        if signed:
+            low, high = -(1 << (bits - 1)), 1 << (bits - 1)
+        else:
+            low, high = 0, 1 << bits
+
+        def encode_int(value: Any) -> Optional[bytes]:
+            if type(value) is not int or not low <= value < high:
+                return None
+            return value.to_bytes(32, "big", signed=signed)
+
+        return encode_int
+    if type_str == "address":
+
+        def encode_address(value: Any) -> Optional[bytes]:
+            # mixed-case (checksummed) addresses are left to eth_abi, which validates the checksum
+            if (
+                not isinstance(value, str)
+                or len(value) != 42
+                or value[:2] != "0x"
+                or not _HEX_DIGITS.issuperset(value[2:])
+            ):
+                return None
+            return bytes(12) + bytes.fromhex(value[2:])
+
+        return encode_address
+    if type_str == "bool":
+
+        def encode_bool(value: Any) -> Optional[bytes]:
+            if type(value) is not bool:
+                return None
+            return value.to_bytes(32, "big")
+
+        return encode_bool
+    match = BYTES_TYPE_RE.fullmatch(type_str)
+    if match and 1 <= int(match.group(1)) <= 32:
+        size = int(match.group(1))
+
+        def encode_bytes(value: Any) -> Optional[bytes]:
+            if type(value) is not bytes or len(value) > size:
+                return None
+            return value.ljust(32, b"\x00")
+
+        return encode_bytes
+    return None
+
+
+def _encode_words(word_encoders: Sequence[WordEncoder], args: Sequence[Any]) -> Optional[bytes]:
+    if len(args) != len(word_encoders):
+        return None
+    words = []
+    for encoder, arg in zip(word_encoders, args):
+        word = encoder(arg)
+        if word is None:
+            return None
+        words.append(word)
+    return b"".join(words)
 
 
 @dataclass
@@ -15,6 +93,25 @@ class MethodCall:
     output_types: List[str]
     to: Optional[Address] = None
 
+    # derived from `method_name` and `input_types`; computed once in `__post_init__`
+    function_signature: str = field(init=False, repr=False, compare=False)
+    function_selector: str = field(init=False, repr=False, compare=False)
+    _input_word_encoders: Optional[List[WordEncoder]] = field(init=False, repr=False, compare=False)
+    _input_encoder: Callable[[Any], bytes] = field(init=False, repr=False, compare=False)
+    _output_decoder: Callable[[ContextFramesBytesIO], Any] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self.function_signature = function_signature(self.method_name, self.input_types)
+        self.function_selector = function_selector(self.function_signature)
+        # look up the ABI coders once, instead of parsing the type strings on every call
+        self._input_encoder = registry.get_encoder("(" + ",".join(self.input_types) + ")")
+        self._output_decoder = registry.get_decoder("(" + ",".join(self.output_types) + ")")
+        # most methods only take one-word value types, which we can encode without eth_abi
+        word_encoders = [_make_word_encoder(type_) for type_ in self.input_types]
+        self._input_word_encoders = word_encoders if all(word_encoders) else None  # type: ignore
+
     def __call__(self, *args, to: Optional[Address] = None) -> "MethodCallParams":
         params = TxParams(data=self.encode_input(*args))
         to = to or self.to
@@ -23,21 +120,30 @@ class MethodCall:
         return MethodCallParams(params, self)
 
     def bind(self, to: Address) -> "MethodCall":
-        return MethodCall(self.method_name, self.input_types, self.output_types, to)
+        # the copy shares the precomputed selector and encoders; no need to run __post_init__ again
+        bound = copy.copy(self)
+        bound.to = to
+        return bound
 
     def encode_input(self, *args) -> str:
-        function_signature = self.method_name + "(" + ",".join(self.input_types) + ")"
-        function_selector = "0x" + keccak(function_signature.encode()).hex()[:8]
-        input_data = eth_abi.encode_abi(self.input_types, args).hex()
-        data = function_selector + input_data
-        return data
+        if not args and not self.input_types:
+            # e.g. `decimals()`, `token0()`: the encoded input is just the selector
+            return self.function_selector
+        if self._input_word_encoders is not None:
+            encoded = _encode_words(self._input_word_encoders, args)
+            if encoded is not None:
+                return self.function_selector + encoded.hex()
+        return self.function_selector + self._input_encoder(args).hex()
 
     def decode_output(self, data: str):
-        return eth_abi.decode_abi(self.output_types, bytes(HexBytes(data)))
+        return self._output_decoder(ContextFramesBytesIO(hex_to_bytes(data)))
 
 
 @dataclass
 class MethodCallParams:
+    # one is created for every contract call, so avoid the per-instance __dict__
+    __slots__ = ("tx_params", "method_call")
+
     tx_params: TxParams
     method_call: MethodCall
 
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import time
-from typing import Optional
+from concurrent.futures import Executor
+from typing import Any, Optional
 
 from .exceptions import Web3APIError
 from .transaction import Transaction
@@ -38,18 +40,54 @@ class Signer(Web3Mixin):
     be sent simultaneously.
     """
 
-    def __init__(self, wallet_address: Address, wallet_private_key: str):
-        self.logger = logging.getLogger(__name__)
+    logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        wallet_address: Address,
+        wallet_private_key: str,
+        poll_interval: float = 1.0,
+        initial_poll_interval: float = 0.2,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            wallet_address: the address of the signer's wallet
+            wallet_private_key: the private key of the signer's wallet
+            poll_interval: the maximum interval in seconds between polls for a transaction receipt
+            initial_poll_interval: the interval in seconds before the first poll; it doubles after
+                each poll until it reaches `poll_interval`
+            executor: the executor to sign transactions in (optional; see `Transaction.sign`)
+        """
         self.wallet_address = wallet_address
         self.wallet_private_key = wallet_private_key
+        # computed once, as the "from" field of every transaction we send
+        self._wallet_checksum_address = wallet_address.to_checksum_address()
+        self.poll_interval = poll_interval
+        self.initial_poll_interval = initial_poll_interval
+        self.executor = executor
 
         # The number of transactions known to have been mined
         self._mined_transaction_count = 0
 
         # maps from nonce to the Transaction object
         self._pending_transactions: dict[int, Transaction] = {}
-
-        self._send_transaction_lock = asyncio.Lock()
+        # the largest key of `_pending_transactions` (-1 if empty), maintained on insert/removal
+        self._max_pending_nonce = -1
+        # Nonces released by transactions that failed to be signed or sent, while later nonces were
+        # already reserved (a min-heap). They are allocated first, to fill the gap that would
+        # otherwise keep the later transactions from ever being mined.
+        self._released_nonces: list[int] = []
+
+        # Serializes the nonce query when there are no pending transactions, so that concurrent
+        # senders share one query. Nonce allocation itself never awaits, so it needs no lock.
+        self._nonce_query_lock = asyncio.Lock()
+
+        # A single background task polls the receipts of all pending transactions, and sets the
+        # event of a transaction (by nonce) once it is mined. It stops when nothing is left to poll.
+        self._receipt_events: dict[int, asyncio.Event] = {}
+        self._poller_task: Optional[asyncio.Task[None]] = None
+        self._current_poll_interval = initial_poll_interval
 
     async def send_in_order_and_wait(self, txs: list[Transaction], timeout: float = 60) -> None:
         """Send multiple transactions in order, then wait for all
@@ -62,7 +100,9 @@ class Signer(Web3Mixin):
         for tx in txs:
             await self.send_transaction(tx)
             wait_tasks.append(
-                asyncio.create_task(self.wait_for_transaction(tx, deadline=time.time() + timeout))
+                asyncio.create_task(
+                    self.wait_for_transaction(tx, deadline=time.monotonic() + timeout)
+                )
             )
         await asyncio.gather(*wait_tasks)
 
@@ -79,7 +119,7 @@ class Signer(Web3Mixin):
             tx: the transaction object to send
             gas_limit: the gas limit to use for the transaction (optional)
             gas_price: the gas price to use for the transaction (optional)
-            deadline: the deadline in epoch seconds (optional)
+            deadline: the deadline in `time.monotonic()` seconds (optional)
         """
         await self.send_transaction(tx, gas_limit, gas_price)
         await self.wait_for_transaction(tx, deadline)
@@ -105,34 +145,48 @@ class Signer(Web3Mixin):
             FailedToSendTransactionError: if we fail to send the transaction
         """
         if gas_limit is not None:
-            tx.params.update({"gas": gas_limit})
+            tx.params["gas"] = gas_limit
         if gas_price is not None:
-            tx.params.update({"gasPrice": gas_price})
-        # We allow only one transaction to be sent at a time. Once transactions are sent out, they
-        # can be waited simultaneously.
-        async with self._send_transaction_lock:
+            tx.params["gasPrice"] = gas_price
+        if "from" not in tx.params:
+            tx.params["from"] = self._wallet_checksum_address
+        # The nonce is reserved by registering the transaction as pending, so that signing (which
+        # also fills in gas, gasPrice and chainId) and sending can run concurrently with other
+        # transactions.
+        try:
+            nonce = await self._reserve_nonce(tx)
+        except Web3APIError as e:
+            raise FailedToSendTransactionError(tx) from e
+        try:
             try:
-                nonce = await self._allocate_next_nonce()
-                tx.params.update({"nonce": nonce})
-                await tx.sign(self.wallet_address, self.wallet_private_key)
+                await tx.sign(self.wallet_address, self.wallet_private_key, executor=self.executor)
                 self.logger.info("sending out transaction nonce=%d", nonce)
                 await tx.send()
             except Web3APIError as e:
                 raise FailedToSendTransactionError(tx) from e
-            self._pending_transactions[nonce] = tx
+        except BaseException:
+            # Release the nonce. If later nonces have been reserved meanwhile, those transactions
+            # cannot be mined until this nonce is used, so it goes to the next transaction sent.
+            self._release_nonce(nonce)
+            raise
+        # poll quickly again for the new transaction
+        self._current_poll_interval = self.initial_poll_interval
+        self._ensure_polling()
 
     async def wait_for_transaction(self, tx: Transaction, deadline: Optional[float] = None) -> None:
         """Wait for transaction to be mined
 
-        The transaction must have been sent out before this method is called.
+        The transaction must have been sent out by this signer before this method is called.
 
-        Note that the optional `deadline` argument should be given in epoch timestamp in seconds. It
-        is only a deadline for waiting for the transaction receipt, and has no effect on sending the
+        Note that the optional `deadline` argument should be given in `time.monotonic()` seconds, e.g.
+        `time.monotonic() + 60`, so that it is not affected by system clock adjustments. It is only a
+        deadline for waiting for the transaction receipt, and has no effect on sending the
         transaction itself.
 
         Args:
             tx: the transaction object to send
-            deadline: the deadline timestamp in seconds. If not set, it will wait indefinitely
+            deadline: the deadline in `time.monotonic()` seconds. If not set, it will wait
+                indefinitely
 
         Raises:
             WaitForTransactionTimeoutError: if we don't receive tx receipt before the deadline
@@ -141,43 +195,143 @@ class Signer(Web3Mixin):
         assert tx.tx_hash is not None
         assert "nonce" in tx.params
         nonce = tx.params["nonce"]
+        event = self._receipt_events[nonce]
         try:
-            while tx.receipt is None:
-                await asyncio.sleep(3)
+            # a deadline that has passed is no reason to time out if the receipt is already here
+            if not event.is_set():
+                timeout = None if deadline is None else deadline - time.monotonic()
                 try:
-                    await self._query_mined_transaction_count()
-                except Web3APIError:
-                    self.logger.exception("Failed to update transaction count")
-                nonce_has_passed = nonce < self._mined_transaction_count
+                    await asyncio.wait_for(self._wait_resolved(event), timeout)
+                except asyncio.TimeoutError:
+                    raise WaitForTransactionTimeoutError(tx) from None
+            if tx.receipt is None:
+                raise FailedToGetReceiptError(tx)
+            # We know at least (nonce + 1) transactions have been mined for this account.
+            self._update_mined_transaction_count(nonce + 1)
+        finally:
+            self._remove_pending_transaction(nonce)
+
+    def _ensure_polling(self) -> asyncio.Task[None]:
+        """Start the poller task if it is not running"""
+        if self._poller_task is None:
+            self._poller_task = asyncio.create_task(self._poll_pending_loop())
+        return self._poller_task
+
+    async def _wait_resolved(self, event: asyncio.Event) -> None:
+        """Wait for the poller to set `event`, restarting the poller if it stops before that
+
+        The poller stops on its own only once every sent transaction is resolved, but it may also
+        be cancelled or fail unexpectedly.
+        """
+        while not event.is_set():
+            poller_task = self._ensure_polling()
+            resolved: asyncio.Future[Any] = asyncio.ensure_future(event.wait())
+            try:
+                await asyncio.wait({resolved, poller_task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                resolved.cancel()
+
+    async def _poll_pending_loop(self) -> None:
+        """Poll pending transactions until all of them are resolved
+
+        A transaction is resolved when its receipt is found, or when the transaction count observed
+        before the latest poll has passed its nonce without a receipt (e.g. it was replaced by
+        another transaction). Its event is set in both cases.
+        """
+        try:
+            while True:
+                unresolved = {
+                    nonce: tx
+                    for nonce, tx in self._pending_transactions.items()
+                    # skip the transactions that are still being signed or sent
+                    if tx.tx_hash is not None and not self._receipt_events[nonce].is_set()
+                }
+                if not unresolved:
+                    return
+                await asyncio.sleep(self._current_poll_interval)
+                self._current_poll_interval = min(
+                    self._current_poll_interval * 2, self.poll_interval
+                )
+                # The count and the receipts of one batch may come from different nodes (e.g. behind
+                # a load balancer), so a receipt missing from the batch whose count has passed the
+                # nonce may just not be known to that node yet. Only a count from an earlier poll
+                # proves that the transaction was dropped.
+                mined_transaction_count = self._mined_transaction_count
                 try:
-                    await tx.check_receipt()
+                    await self._query_pending_transactions(list(unresolved.values()))
                 except Web3APIError:
-                    self.logger.exception("Failed to query check transaction receipt")
-                if tx.receipt is None and nonce_has_passed:
-                    raise FailedToGetReceiptError(tx)
-                if deadline is not None and time.time() > deadline:
-                    raise WaitForTransactionTimeoutError(tx)
-            if tx.receipt is not None:
-                # We know at least (nonce + 1) transactions have been mined for this account.
-                self._update_mined_transaction_count(nonce + 1)
+                    self.logger.exception("Failed to poll pending transactions")
+                    continue
+                for nonce, tx in unresolved.items():
+                    # the waiter may have given up (timeout or cancellation) during the query
+                    if self._pending_transactions.get(nonce) is not tx:
+                        continue
+                    if tx.receipt is not None or nonce < mined_transaction_count:
+                        self._receipt_events[nonce].set()
+        except Exception:
+            # should not happen; the waiters restart the poller (see `_wait_resolved`)
+            self.logger.exception("Failed to poll pending transactions")
         finally:
-            self._pending_transactions.pop(nonce)
+            self._poller_task = None
 
-    async def _allocate_next_nonce(self) -> int:
-        """Allocate nonce for the next transaction
+    async def _query_pending_transactions(self, txs: list[Transaction]) -> None:
+        """Update the mined transaction count and the receipts of the given transactions
 
-        When there are no pending transactions, we query Web3 for the nonce.
+        Everything is queried in a single JSON-RPC batch, so that polling N transactions does not
+        cost N times the requests.
+        """
+        transaction_count, receipts = await self.web3.get_transaction_count_and_receipts(
+            self.wallet_address, [tx.tx_hash for tx in txs]  # type: ignore
+        )
+        self._update_mined_transaction_count(transaction_count)
+        for tx, receipt in zip(txs, receipts):
+            if receipt is not None:
+                tx.receipt = receipt
+                self.logger.info("Received transaction receipt: %s", receipt)
+
+    async def _reserve_nonce(self, tx: Transaction) -> int:
+        """Allocate the nonce for a transaction, and register the transaction as pending
 
-        When there are pending transactions, we skip querying Web3 and use the next nonce.
+        When there are no pending transactions, we query Web3 for the nonce first.
         """
-        if self._pending_transactions:
-            return max(
-                self._mined_transaction_count,
-                max(self._pending_transactions.keys()) + 1,
-            )
-        else:
-            await self._query_mined_transaction_count()
-            return self._mined_transaction_count
+        if not self._pending_transactions:
+            async with self._nonce_query_lock:
+                # a concurrent sender may have reserved a nonce while we were waiting for the lock
+                if not self._pending_transactions:
+                    await self._query_mined_transaction_count()
+        # no awaits from here on, so that allocating and reserving the nonce is atomic
+        nonce = self._allocate_next_nonce()
+        tx.params["nonce"] = nonce
+        self._pending_transactions[nonce] = tx
+        self._receipt_events[nonce] = asyncio.Event()
+        self._max_pending_nonce = max(self._max_pending_nonce, nonce)
+        return nonce
+
+    def _release_nonce(self, nonce: int) -> None:
+        """Remove a transaction that was never sent, so that its nonce is allocated again"""
+        self._remove_pending_transaction(nonce)
+        if nonce < self._max_pending_nonce:
+            heapq.heappush(self._released_nonces, nonce)
+
+    def _remove_pending_transaction(self, nonce: int) -> None:
+        self._pending_transactions.pop(nonce)
+        self._receipt_events.pop(nonce)
+        if nonce == self._max_pending_nonce:
+            # usually the last pending transaction, so this scan is cheap
+            self._max_pending_nonce = max(self._pending_transactions, default=-1)
+
+    def _allocate_next_nonce(self) -> int:
+        """Allocate nonce for the next transaction
+
+        When there are pending transactions, we skip querying Web3 and use the next nonce, unless a
+        released nonce leaves a gap in front of them.
+        """
+        while self._released_nonces:
+            nonce = heapq.heappop(self._released_nonces)
+            # the gap may have been filled meanwhile, e.g. by a send that reached the node after all
+            if self._mined_transaction_count <= nonce < self._max_pending_nonce:
+                return nonce
+        return max(self._mined_transaction_count, self._max_pending_nonce + 1)
 
     def _update_mined_transaction_count(self, transaction_count: int) -> None:
         """Update mined transaction count -- only if the new value is greater than the old value"""
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from concurrent.futures import Executor
 from typing import Optional, Union
 
 from eth_account import Account
@@ -12,10 +13,20 @@ from .methodcall import MethodCallParams
 from .types import Address, TxHash, TxParams, TxReceipt
 from .web3mixin import Web3Mixin
 
+_account_sign_transaction = Account.sign_transaction
+
+
+def _sign_transaction(params: TxParams, private_key: str) -> SignedTransaction:
+    # a module-level function, so that it can be sent to a ProcessPoolExecutor (the
+    # `Account.sign_transaction` combomethod cannot be pickled)
+    return _account_sign_transaction(params, private_key)
+
 
 class Transaction(Web3Mixin):
     """Represents a Web3 transaction"""
 
+    __slots__ = ("params", "signed_tx", "tx_hash", "receipt")
+
     logger = logging.getLogger(__name__)
 
     def __init__(self, params: Union[TxParams, MethodCallParams]):
@@ -29,28 +40,22 @@ class Transaction(Web3Mixin):
         self.receipt: Optional[TxReceipt] = None
 
     async def _set_default_chain_id(self) -> None:
-        if "chainId" not in self.params:
-            self.params.update({"chainId": await self.web3.chain_id})
+        self.params["chainId"] = await self.web3.chain_id
 
     async def _set_default_gas(self) -> None:
-        if "gas" not in self.params:
-            # note that we generally need to set "from" before estimating gas
-            gas = await self.web3.estimate_gas(self.params)
-            self.params.update({"gas": gas * 2})
+        # note that we generally need to set "from" before estimating gas
+        gas = await self.web3.estimate_gas(self.params)
+        self.params["gas"] = gas * 2
 
     async def _set_default_gas_price(self, gas_multiplier: float) -> None:
-        if "maxPriorityFeePerGas" in self.params or "maxFeePerGas" in self.params:
-            return
-        if "gasPrice" not in self.params:
-            gas_price = await self.web3.gas_price
-            gas_price = int(gas_price * gas_multiplier)
-            self.params.update({"gasPrice": gas_price})
+        gas_price = await self.web3.gas_price
+        gas_price = int(gas_price * gas_multiplier)
+        self.params["gasPrice"] = gas_price
 
     async def _set_default_nonce(self, wallet_address: Address, nonce_offset: int):
-        if "nonce" not in self.params:
-            nonce = await self.web3.get_transaction_count(wallet_address)
-            nonce += nonce_offset
-            self.params.update({"nonce": nonce})
+        nonce = await self.web3.get_transaction_count(wallet_address)
+        nonce += nonce_offset
+        self.params["nonce"] = nonce
 
     async def sign(
         self,
@@ -58,51 +63,72 @@ class Transaction(Web3Mixin):
         wallet_private_key: str,
         nonce_offset: int = 0,
         gas_multiplier: float = 1.0,
+        executor: Optional[Executor] = None,
     ) -> "Transaction":
         """Sign the transaction with the private key
 
         Fill in the following fields if not yet set: chainId, gas, gasPrice, nonce
 
+        Signing takes a few milliseconds of CPU time, so it runs in `executor` (or the event loop's
+        default thread pool) to avoid blocking the event loop.
+
         Args:
             wallet_address: the address of the signer's wallet
             wallet_private_key: the private key of the signer's wallet
             nonce_offset: the nonce offset to use
             gas_multiplier: if no gas price is set, this is used to set the gas price
+            executor: the executor to sign in, e.g. a ProcessPoolExecutor to sign many
+                transactions in parallel (optional)
 
         Returns:
             self (with the "signed_tx" field set)
         """
-        start_ts = time.time()
+        start_ts = time.monotonic()
         if "from" not in self.params:
-            self.params.update({"from": wallet_address.to_checksum_address()})
-        await asyncio.gather(
-            self._set_default_chain_id(),
-            self._set_default_gas(),
-            self._set_default_gas_price(gas_multiplier),
-            self._set_default_nonce(wallet_address, nonce_offset),
+            self.params["from"] = wallet_address.to_checksum_address()
+        # only query the missing fields; when all are set (e.g. by Signer), skip the gather entirely
+        params = self.params
+        defaults = []
+        if "chainId" not in params:
+            defaults.append(self._set_default_chain_id())
+        if "gas" not in params:
+            defaults.append(self._set_default_gas())
+        if (
+            "gasPrice" not in params
+            and "maxPriorityFeePerGas" not in params
+            and "maxFeePerGas" not in params
+        ):
+            defaults.append(self._set_default_gas_price(gas_multiplier))
+        if "nonce" not in params:
+            defaults.append(self._set_default_nonce(wallet_address, nonce_offset))
+        if defaults:
+            await asyncio.gather(*defaults)
+        self.signed_tx = await asyncio.get_running_loop().run_in_executor(
+            executor, _sign_transaction, self.params, wallet_private_key
         )
-        self.signed_tx = Account.sign_transaction(self.params, wallet_private_key)
-        elapsed_time = time.time() - start_ts
+        elapsed_time = time.monotonic() - start_ts
         self.logger.info(f"Signed transaction: {self.params} ({elapsed_time*1e3:.3f}ms)")
         return self
 
     async def send(self) -> TxHash:
-        start_ts = time.time()
+        start_ts = time.monotonic()
         assert self.signed_tx is not None
         self.tx_hash = await self.web3.send_signed_transaction(self.signed_tx)
-        elapsed_time = time.time() - start_ts
+        elapsed_time = time.monotonic() - start_ts
         self.logger.info(f"Sent transaction: {self.tx_hash} ({elapsed_time*1e3:.3f}ms)")
         return self.tx_hash
 
     async def check_receipt(self) -> Optional[TxReceipt]:
+        """Query the receipt once, without waiting; returns None if the tx is not mined yet"""
         assert self.tx_hash is not None
-        self.receipt = await self.web3.wait_for_transaction_receipt(self.tx_hash)
-        self.logger.info("Received transaction receipt: %s", self.receipt)
+        self.receipt = await self.web3.get_transaction_receipt(self.tx_hash)
+        if self.receipt is not None:
+            self.logger.info("Received transaction receipt: %s", self.receipt)
         return self.receipt
 
     async def wait(self, timeout: float = 120.0) -> TxReceipt:
         assert self.tx_hash is not None
-        start_ts = time.time()
+        start_ts = time.monotonic()
         try:
             receipt = await asyncio.wait_for(
                 self.web3.wait_for_transaction_receipt(self.tx_hash), timeout=timeout
@@ -111,7 +137,7 @@ class Transaction(Web3Mixin):
             self.logger.error("Timeout for transaction! %s", self.tx_hash)
             raise
         else:
-            elapsed_time = time.time() - start_ts
+            elapsed_time = time.monotonic() - start_ts
             self.logger.info(
                 f"Received transaction receipt: {self.receipt} ({elapsed_time*1e3:.3f}ms)"
             )
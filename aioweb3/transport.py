@@ -13,7 +13,18 @@ import asyncio
 import itertools
 import json
 import logging
-from typing import Any, Dict, Literal, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import aiohttp
 import pydantic
@@ -23,6 +34,37 @@ from websockets.legacy.client import WebSocketClientProtocol, connect
 from .endpoints import RPCMethod
 from .exceptions import Web3APIError, Web3TimeoutError
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson is optional, but a lot faster than json
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize `obj` into compact JSON bytes, using orjson if it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. integers over 64 bits, which orjson does not support
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or text, using orjson if it is installed
+
+    Note that orjson parses integers over 64 bits as floats. This is not a concern for Web3
+    responses, which encode quantities as hex strings.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # let json have a go at it (e.g. lone surrogates), and raise the usual errors
+            pass
+    return json.loads(data)
+
 
 class Subscription:
     """Holds information and data for a Web3 subscription"""
@@ -42,14 +84,17 @@ class Subscription:
     async def __anext__(self):
         return await self.queue.get()
 
+    async def get_batch(self, max_items: int = 256) -> List[Any]:
+        """Wait for the next item, and return it together with any items already queued
 
-class RequestMessage(pydantic.BaseModel):
-    """Representing a Web3 request"""
-
-    jsonrpc: Literal["2.0"]
-    method: str
-    params: Any
-    id: int
+        Returns at most `max_items` items. Consuming a busy subscription in batches avoids waking
+        up the consumer once per item.
+        """
+        items = [await self.queue.get()]
+        queue = self.queue
+        while len(items) < max_items and not queue.empty():
+            items.append(queue.get_nowait())
+        return items
 
 
 class ResponseMessage(pydantic.BaseModel):
@@ -79,6 +124,38 @@ class NotificationMessage(pydantic.BaseModel):
     params: NotificationParams
 
 
+def _to_response_message(j: Dict[str, Any]) -> ResponseMessage:
+    """Build a ResponseMessage from a parsed JSON object
+
+    Well-formed responses only need the checks below, so we skip the (much slower) pydantic
+    validation for them. Anything else is fully validated, which raises a descriptive error.
+    """
+    if j.get("jsonrpc") == "2.0" and type(j.get("id")) is int:
+        return ResponseMessage.construct(
+            jsonrpc="2.0", error=j.get("error"), result=j.get("result"), id=j["id"]
+        )
+    return ResponseMessage(**j)
+
+
+def _to_notification_message(j: Dict[str, Any]) -> NotificationMessage:
+    """Build a NotificationMessage from a parsed JSON object (see `_to_response_message`)"""
+    params = j.get("params")
+    if (
+        j.get("jsonrpc") == "2.0"
+        and j.get("method") == "eth_subscription"
+        and type(params) is dict
+        and type(params.get("subscription")) is str
+    ):
+        return NotificationMessage.construct(
+            jsonrpc="2.0",
+            method="eth_subscription",
+            params=NotificationParams.construct(
+                subscription=params["subscription"], result=params.get("result")
+            ),
+        )
+    return NotificationMessage(**j)
+
+
 class BaseTransport(abc.ABC):
     """Base class for the transportation layer
 
@@ -110,20 +187,66 @@ class BaseTransport(abc.ABC):
             "params": params or [],
             "id": request_id,
         }
-        request = RequestMessage(**rpc_dict)
+        # the request is built locally, so we serialize it directly without a pydantic model
+        data = _json_dumps(rpc_dict)
         try:
-            response = await asyncio.wait_for(self._send_request(request), timeout=timeout)
+            response = await asyncio.wait_for(self._send_request(request_id, data), timeout=timeout)
             if response.error:
-                raise Web3APIError(f"Received error response {response} for request {request}")
+                raise Web3APIError(f"Received error response {response} for request {rpc_dict}")
         except asyncio.TimeoutError as exc:
             raise Web3TimeoutError(
-                f"Timeout after {timeout} seconds for request {request}"
+                f"Timeout after {timeout} seconds for request {rpc_dict}"
             ) from exc
         return response.result
 
     @abc.abstractmethod
-    async def _send_request(self, request: RequestMessage) -> ResponseMessage:
-        """Actual implementation for `send_request`"""
+    async def _send_request(self, request_id: int, data: bytes) -> ResponseMessage:
+        """Actual implementation for `send_request`
+
+        `data` is the serialized request with id `request_id`.
+        """
+
+    async def send_batch(self, calls: Sequence[Tuple[str, Any]], timeout: float = 60) -> List[Any]:
+        """Send multiple Web3 requests as a single JSON-RPC batch and return the responses
+
+        `calls` is a sequence of (method, params) pairs. The results are returned in the same order
+        as the calls. The whole batch costs a single round-trip to the server.
+
+        This method raises Web3APIError if any of the requests got an error response. It may also
+        raise Web3TimeoutError if the batch timed out.
+        """
+        if not calls:
+            return []
+        request_ids = [next(self._rpc_counter) for _ in calls]
+        requests = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": request_id}
+            for (method, params), request_id in zip(calls, request_ids)
+        ]
+        try:
+            responses = await asyncio.wait_for(
+                self._send_batch(request_ids, _json_dumps(requests)), timeout=timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise Web3TimeoutError(
+                f"Timeout after {timeout} seconds for batch of {len(requests)} requests"
+            ) from exc
+        responses_by_id = {response.id: response for response in responses}
+        results = []
+        for request_id, request in zip(request_ids, requests):
+            response = responses_by_id.get(request_id)
+            if response is None:
+                raise Web3APIError(f"Missing response for request {request}")
+            if response.error:
+                raise Web3APIError(f"Received error response {response} for request {request}")
+            results.append(response.result)
+        return results
+
+    @abc.abstractmethod
+    async def _send_batch(self, request_ids: List[int], data: bytes) -> List[ResponseMessage]:
+        """Actual implementation for `send_batch`
+
+        `data` is the serialized batch of requests with ids `request_ids`.
+        """
 
     async def subscribe(self, params: Any) -> Subscription:
         """Make a new subscription
@@ -139,15 +262,25 @@ class BaseTransport(abc.ABC):
         """
         raise NotImplementedError
 
-    def _parse_message(self, msg: bytes) -> Union[ResponseMessage, NotificationMessage]:
-        """Parse the response message from Web3 server"""
-        self.logger.debug("inbound: %s", msg.decode().rstrip("\n"))
+    def _parse_message(
+        self, msg: Union[bytes, str]
+    ) -> Union[ResponseMessage, NotificationMessage, List[ResponseMessage]]:
+        """Parse the response message from Web3 server
+
+        A response to a batch request is parsed into a list of ResponseMessage.
+        """
+        # decoding a large message just to drop the log record is expensive, so check first
+        if self.logger.isEnabledFor(logging.DEBUG):
+            text = msg if isinstance(msg, str) else msg.decode()
+            self.logger.debug("inbound: %s", text.rstrip("\n"))
         try:
-            j = json.loads(msg)
-            if "method" in j:
-                return NotificationMessage(**j)
+            j = _json_loads(msg)
+            if isinstance(j, list):
+                return [_to_response_message(item) for item in j]
+            elif "method" in j:
+                return _to_notification_message(j)
             else:
-                return ResponseMessage(**j)
+                return _to_response_message(j)
         except Exception as exc:
             raise Web3APIError("Failed to parse message {!r}".format(msg)) from exc
 
@@ -162,26 +295,23 @@ class PersistentListener:
 
     def __init__(self, listen_func) -> None:
         self.listen_func = listen_func
+        # created with the listening task, so that no event loop is needed to build a transport
         self.is_listening: Optional[asyncio.Event] = None
         self.task: Optional[asyncio.Task] = None
+        # incremented each time the listening task is (re)started
+        self.generation = 0
 
-    async def __aenter__(self) -> None:
-        if self.task is None or self.task.done():
+    def ensure_started(self) -> asyncio.Event:
+        """Start the listening task if it is not running
+
+        Returns an event that is set once the listener is ready. Callers should wait for it (only
+        if it is not set yet, to avoid yielding to the event loop) before sending a request.
+        """
+        if self.task is None or self.task.done() or self.is_listening is None:
+            self.generation += 1
             self.is_listening = asyncio.Event()
             self.task = asyncio.create_task(self.listen_func())
-            # make sure that we started listening before proceeding
-            await self.is_listening.wait()
-
-    async def __aexit__(
-        self, exc_type: Type[BaseException], exc_val: BaseException, exc_tb
-    ) -> None:
-        if exc_val is not None:
-            try:
-                if self.task is not None:
-                    self.task.cancel()
-            except Exception:  # pylint: disable=broad-except
-                pass
-            self.task = None
+        return self.is_listening
 
     def is_ready(self) -> None:
         """Callback for the listening function to signal that it is ready to accept responses"""
@@ -198,33 +328,78 @@ class PersistentListener:
 class TwoWayTransport(BaseTransport, metaclass=abc.ABCMeta):
     """Shared base class for WebSocketTransport and IPCTransport"""
 
+    # Maximum number of unconsumed items per subscription. Once a subscription's queue is full,
+    # the oldest items are dropped, so that a slow consumer cannot grow memory without limit.
+    subscription_queue_size = 10_000
+
     def __init__(self, uri: str):
         super().__init__(uri)
         self.listener = PersistentListener(self.listen)
         self._requests: Dict[int, asyncio.Future[ResponseMessage]] = {}
+        # the listener generation that each pending request is sent on (see `listen`)
+        self._request_generations: Dict[int, int] = {}
         self._subscriptions: Dict[str, asyncio.Queue[Any]] = {}
+        # the number of items dropped so far by each subscription that is currently full
+        self._dropped_items: Dict[str, int] = {}
 
-    async def _send_request(self, request: RequestMessage) -> ResponseMessage:
-        data = json.dumps(request.dict(), separators=(",", ":")).encode("utf-8")
-        fut = asyncio.get_event_loop().create_future()
-        self._requests[request.id] = fut
+    async def _send_request(self, request_id: int, data: bytes) -> ResponseMessage:
+        fut = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = fut
         try:
-            self.logger.debug("outbound: %s", data.decode())
-            async with self.listener:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("outbound: %s", data.decode())
+            listener_ready = self.listener.ensure_started()
+            self._request_generations[request_id] = self.listener.generation
+            if not listener_ready.is_set():
+                await listener_ready.wait()
+            if not fut.done():  # i.e. the listener did not fail to start
                 await self.send(data)
-                result = await fut
+            result = await fut
+        except BaseException:
+            # e.g. a timeout: restart the listener, and with it the connection, for the next request
+            self.listener.close()
+            raise
         finally:
             # whether we got an error or not, we're done with this request
-            del self._requests[request.id]
+            self._requests.pop(request_id, None)
+            self._request_generations.pop(request_id, None)
         return result
 
+    async def _send_batch(self, request_ids: List[int], data: bytes) -> List[ResponseMessage]:
+        loop = asyncio.get_running_loop()
+        futs = []
+        for request_id in request_ids:
+            fut = loop.create_future()
+            self._requests[request_id] = fut
+            futs.append(fut)
+        try:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("outbound: %s", data.decode())
+            listener_ready = self.listener.ensure_started()
+            generation = self.listener.generation
+            for request_id in request_ids:
+                self._request_generations[request_id] = generation
+            if not listener_ready.is_set():
+                await listener_ready.wait()
+            if not futs[0].done():  # i.e. the listener did not fail to start
+                await self.send(data)
+            results = await asyncio.gather(*futs)
+        except BaseException:
+            self.listener.close()
+            raise
+        finally:
+            for request_id in request_ids:
+                self._requests.pop(request_id, None)
+                self._request_generations.pop(request_id, None)
+        return list(results)
+
     async def subscribe(self, params: Any) -> Subscription:
         """Make a new subscription
 
         Documentation: https://geth.ethereum.org/docs/rpc/pubsub
         """
         subscription_id = await self.send_request(RPCMethod.eth_subscribe, params)
-        queue: asyncio.Queue = asyncio.Queue()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscription_queue_size)
         self._subscriptions[subscription_id] = queue
         return Subscription(subscription_id, queue)
 
@@ -235,6 +410,7 @@ class TwoWayTransport(BaseTransport, metaclass=abc.ABCMeta):
         assert response
         queue = self._subscriptions[subscription.id]
         del self._subscriptions[subscription.id]
+        self._dropped_items.pop(subscription.id, None)
         queue.task_done()
 
     @abc.abstractmethod
@@ -242,8 +418,8 @@ class TwoWayTransport(BaseTransport, metaclass=abc.ABCMeta):
         """Send binary data to the Web3 server"""
 
     @abc.abstractmethod
-    async def receive(self) -> bytes:
-        """Receive binary data from the Web3 server"""
+    async def receive(self) -> Union[bytes, str]:
+        """Receive a message from the Web3 server, as either binary data or text"""
 
     @abc.abstractmethod
     async def close(self):
@@ -254,15 +430,34 @@ class TwoWayTransport(BaseTransport, metaclass=abc.ABCMeta):
         self.listener.close()
 
     def _handle_response_message(self, response: ResponseMessage):
-        if response.id in self._requests:
-            self._requests[response.id].set_result(response)
+        # popped, so that a duplicate response is reported below instead of failing set_result
+        fut = self._requests.pop(response.id, None)
+        if fut is not None and not fut.done():
+            fut.set_result(response)
         else:
             self.logger.warning("Unsolicitated response message: %s", response)
 
     def _handle_notification_message(self, notification: NotificationMessage):
         sub_id = notification.params.subscription
-        if sub_id in self._subscriptions:
-            self._subscriptions[sub_id].put_nowait(notification.params.result)
+        queue = self._subscriptions.get(sub_id)
+        if queue is not None:
+            # logged once when a subscription starts dropping items, and once when it catches up,
+            # instead of once per item while the consumer is behind
+            if queue.full():
+                queue.get_nowait()
+                dropped = self._dropped_items.get(sub_id, 0)
+                if not dropped:
+                    self.logger.warning(
+                        "Subscription %s is full; dropping the oldest items", sub_id
+                    )
+                self._dropped_items[sub_id] = dropped + 1
+            elif sub_id in self._dropped_items:
+                self.logger.warning(
+                    "Subscription %s caught up after dropping %d items",
+                    sub_id,
+                    self._dropped_items.pop(sub_id),
+                )
+            queue.put_nowait(notification.params.result)
         else:
             self.logger.warning("Unsolicitated notification message: %s", notification)
 
@@ -273,42 +468,105 @@ class TwoWayTransport(BaseTransport, metaclass=abc.ABCMeta):
         sure that the listener is running for new requests.
         """
         self.logger.info("Starting listening for messages %s", self.uri)
-        handlers = {
-            ResponseMessage: self._handle_response_message,
-            NotificationMessage: self._handle_notification_message,
-        }
-        while True:
-            msg = await self.receive()
-            parsed = self._parse_message(msg)
-            handlers[type(parsed)](parsed)
+        # A replacement listener (with a new connection) may start before this one has finished
+        # stopping, e.g. while an old WebSocket is still closing. Only the requests sent on this
+        # generation are ours to fail, and only our ready event is ours to set.
+        generation = self.listener.generation
+        is_listening = self.listener.is_listening
+        # bound once here, instead of on every message
+        receive = self.receive
+        parse_message = self._parse_message
+        pop_request = self._requests.pop
+        handle_response = self._handle_response_message
+        handle_notification = self._handle_notification_message
+        try:
+            while True:
+                parsed = parse_message(await receive())
+                if parsed.__class__ is ResponseMessage:
+                    # same as `_handle_response_message`, inlined for the most common message
+                    fut = pop_request(parsed.id, None)
+                    if fut is not None and not fut.done():
+                        fut.set_result(parsed)
+                    else:
+                        self.logger.warning("Unsolicitated response message: %s", parsed)
+                elif parsed.__class__ is list:
+                    # response to a batch request
+                    for response in parsed:
+                        handle_response(response)
+                else:
+                    handle_notification(parsed)
+        except BaseException as exc:
+            # No responses will arrive for the pending requests any more. Fail them right away,
+            # instead of leaving them waiting for their timeouts.
+            request_generations = self._request_generations
+            for request_id, fut in self._requests.items():
+                if not fut.done() and request_generations.get(request_id) == generation:
+                    error = Web3APIError(f"Stopped listening for messages from {self.uri}")
+                    error.__cause__ = exc
+                    fut.set_exception(error)
+            # wake up the requests waiting for the listener to be ready
+            if is_listening is not None:
+                is_listening.set()
+            raise
 
 
 class PersistentSocket:
     """Helps IPCTransport to establish a persistent socket connection to the Web3 server"""
 
+    # Maximum size of a message. asyncio's default of 64 KiB is exceeded by many ordinary
+    # responses (e.g. full blocks, large `eth_getLogs` results); the buffer only grows as needed.
+    read_limit = 1 << 28
+
     def __init__(self, ipc_path: str) -> None:
         self.ipc_path = ipc_path
         self.reader_writer: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._connecting: Optional[asyncio.Future] = None
 
-    async def __aenter__(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    async def ensure_connected(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Return the connection, connecting first if there is none
+
+        Callers on the hot path should use `reader_writer` directly when it is set, and only call
+        this method otherwise.
+        """
         if self.reader_writer is None:
-            self.reader_writer = await asyncio.open_unix_connection(self.ipc_path)
+            # concurrent callers share the same connection attempt
+            if self._connecting is None:
+                self._connecting = asyncio.ensure_future(
+                    asyncio.open_unix_connection(self.ipc_path, limit=self.read_limit)
+                )
+                self._connecting.add_done_callback(self._on_connected)
+            return await asyncio.shield(self._connecting)
         return self.reader_writer
 
-    async def __aexit__(
-        self, exc_type: Type[BaseException], exc_val: BaseException, exc_tb
+    def _on_connected(
+        self, connecting: "asyncio.Future[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]"
     ) -> None:
-        if exc_val is not None:
-            try:
-                if self.reader_writer is not None:
-                    _, writer = self.reader_writer
-                    writer.close()
-            except Exception:  # pylint: disable=broad-except
-                pass
-            self.reader_writer = None
+        # Done here rather than by the callers, which may all be cancelled before the attempt is
+        # over. The connection must not leak, and the next caller must not start a second attempt.
+        if connecting is not self._connecting:
+            return  # abandoned by `close`
+        self._connecting = None
+        if not connecting.cancelled() and connecting.exception() is None:
+            self.reader_writer = connecting.result()
+
+    def discard(self) -> None:
+        """Close the connection after an error, so that the next caller reconnects"""
+        try:
+            if self.reader_writer is not None:
+                _, writer = self.reader_writer
+                writer.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        self.reader_writer = None
 
     async def close(self):
-        """Close the socket connection"""
+        """Close the socket connection, and abandon any connection attempt"""
+        connecting, self._connecting = self._connecting, None
+        # an attempt that is already over cannot be cancelled; close the connection it made, if any
+        if connecting is not None and not connecting.cancel():
+            if not connecting.cancelled() and connecting.exception() is None:
+                _, writer = connecting.result()
+                writer.close()
         if self.reader_writer is not None:
             _, writer = self.reader_writer
             writer.close()
@@ -323,15 +581,24 @@ class IPCTransport(TwoWayTransport):
         self.socket = PersistentSocket(local_ipc_path)
 
     async def send(self, data: bytes):
-        async with self.socket as (_, writer):
+        reader_writer = self.socket.reader_writer or await self.socket.ensure_connected()
+        try:
+            _, writer = reader_writer
             writer.write(data)
             await writer.drain()
+        except BaseException:
+            self.socket.discard()
+            raise
 
     async def receive(self) -> bytes:
-        async with self.socket as (reader, _):
-            self.listener.is_ready()
-            msg = await reader.readuntil()
-        return msg
+        reader_writer = self.socket.reader_writer or await self.socket.ensure_connected()
+        self.listener.is_ready()
+        try:
+            reader, _ = reader_writer
+            return await reader.readuntil()
+        except BaseException:
+            self.socket.discard()
+            raise
 
     async def close(self) -> None:
         await super().close()  # first stop listening
@@ -345,25 +612,48 @@ class PersistentWebSocket:
         self.ws: Optional[WebSocketClientProtocol] = None
         self.endpoint_uri = endpoint_uri
         self.websocket_kwargs = websocket_kwargs
+        self._connecting: Optional[asyncio.Future] = None
 
-    async def __aenter__(self) -> WebSocketClientProtocol:
+    async def ensure_connected(self) -> WebSocketClientProtocol:
+        """Return the connection, connecting first if there is none
+
+        Callers on the hot path should use `ws` directly when it is set, and only call this method
+        otherwise.
+        """
         if self.ws is None:
-            self.ws = await connect(uri=self.endpoint_uri, **self.websocket_kwargs)
+            # concurrent callers share the same connection attempt
+            if self._connecting is None:
+                self._connecting = asyncio.ensure_future(
+                    connect(uri=self.endpoint_uri, **self.websocket_kwargs)
+                )
+                self._connecting.add_done_callback(self._on_connected)
+            return await asyncio.shield(self._connecting)
         return self.ws
 
-    async def __aexit__(
-        self, exc_type: Type[BaseException], exc_val: BaseException, exc_tb
-    ) -> None:
-        if exc_val is not None:
-            try:
-                if self.ws is not None:
-                    await self.ws.close()
-            except Exception:  # pylint: disable=broad-except
-                pass
-            self.ws = None
+    def _on_connected(self, connecting: "asyncio.Future[WebSocketClientProtocol]") -> None:
+        # see PersistentSocket._on_connected
+        if connecting is not self._connecting:
+            return
+        self._connecting = None
+        if not connecting.cancelled() and connecting.exception() is None:
+            self.ws = connecting.result()
+
+    async def discard(self) -> None:
+        """Close the connection after an error, so that the next caller reconnects"""
+        ws, self.ws = self.ws, None
+        try:
+            if ws is not None:
+                await ws.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
 
     async def close(self):
-        """Close the WebSocket connection"""
+        """Close the WebSocket connection, and abandon any connection attempt"""
+        connecting, self._connecting = self._connecting, None
+        # see PersistentSocket.close
+        if connecting is not None and not connecting.cancel():
+            if not connecting.cancelled() and connecting.exception() is None:
+                await connecting.result().close()
         if self.ws is not None:
             await self.ws.close()
             self.ws = None
@@ -380,17 +670,22 @@ class WebsocketTransport(TwoWayTransport):
         self.conn = PersistentWebSocket(websocket_uri, websocket_kwargs)
 
     async def send(self, data: bytes):
-        async with self.conn as conn:
+        conn = self.conn.ws or await self.conn.ensure_connected()
+        try:
             await conn.send(data)
+        except BaseException:
+            await self.conn.discard()
+            raise
 
-    async def receive(self) -> bytes:
-        async with self.conn as conn:
-            self.listener.is_ready()
-            msg = await conn.recv()
-            if isinstance(msg, str):
-                return msg.encode()
-            else:
-                return msg
+    async def receive(self) -> Union[bytes, str]:
+        conn = self.conn.ws or await self.conn.ensure_connected()
+        self.listener.is_ready()
+        try:
+            # nodes send text frames, which are returned as str; the JSON parser takes them as-is
+            return await conn.recv()
+        except BaseException:
+            await self.conn.discard()
+            raise
 
     async def close(self) -> None:
         await super().close()  # first stop listening
@@ -400,12 +695,20 @@ class WebsocketTransport(TwoWayTransport):
 class PersistentHTTPSession:
     """Helps HTTPTransport to establish a persistent HTTP session to the Web3 server"""
 
-    def __init__(self):
+    def __init__(self, session_kwargs: Mapping[str, Any]) -> None:
         self.session: Optional[aiohttp.ClientSession] = None
+        self.session_kwargs = session_kwargs
 
     async def __aenter__(self) -> aiohttp.ClientSession:
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            kwargs = dict(self.session_kwargs)
+            if "connector" not in kwargs:
+                # keep idle connections for longer than aiohttp's default of 15 seconds, so that
+                # requests spaced out by a few blocks reuse the connection (and its TLS session),
+                # but close them before the 60-second idle timeout common to load balancers, which
+                # would otherwise fail the next request on a connection it had already dropped
+                kwargs["connector"] = aiohttp.TCPConnector(keepalive_timeout=55)
+            self.session = aiohttp.ClientSession(**kwargs)
         return self.session
 
     async def __aexit__(
@@ -427,16 +730,23 @@ class PersistentHTTPSession:
 
 
 class HTTPTransport(BaseTransport):
-    """Transport via HTTP"""
+    """Transport via HTTP
 
-    def __init__(self, http_uri: str):
+    `session_kwargs` are passed to `aiohttp.ClientSession`. Latency-sensitive users can use it to
+    tune the connection pool, e.g. `{"connector": aiohttp.TCPConnector(limit_per_host=32)}`. By
+    default, idle connections are kept alive for 55 seconds.
+    """
+
+    def __init__(self, http_uri: str, session_kwargs: Optional[Mapping[str, Any]] = None):
         super().__init__(http_uri)
         self._http_uri = http_uri
-        self.session = PersistentHTTPSession()
+        if session_kwargs is None:
+            session_kwargs = {}
+        self.session = PersistentHTTPSession(session_kwargs)
 
-    async def _send_request(self, request: RequestMessage) -> ResponseMessage:
-        data = json.dumps(request.dict(), separators=(",", ":")).encode("utf-8")
-        self.logger.debug("outbound: %s", data.decode())
+    async def _send_request(self, request_id: int, data: bytes) -> ResponseMessage:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("outbound: %s", data.decode())
         payload = BytesPayload(data, content_type="application/json")
         async with self.session as session:
             async with session.post(self._http_uri, data=payload) as resp:
@@ -445,6 +755,19 @@ class HTTPTransport(BaseTransport):
         assert isinstance(parsed, ResponseMessage)
         return parsed
 
+    async def _send_batch(self, request_ids: List[int], data: bytes) -> List[ResponseMessage]:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("outbound: %s", data.decode())
+        payload = BytesPayload(data, content_type="application/json")
+        async with self.session as session:
+            async with session.post(self._http_uri, data=payload) as resp:
+                res = await resp.read()
+        parsed = self._parse_message(res)
+        if not isinstance(parsed, list):
+            # servers reply with a single error object when the batch itself is rejected
+            raise Web3APIError(f"Received non-batch response {parsed} for batch request")
+        return parsed
+
     async def close(self):
         await self.session.close()
 
@@ -1,17 +1,45 @@
 from __future__ import annotations
 
+import functools
 import typing
-from typing import Generic, List, Literal, NewType, Optional, TypeVar, Union, cast
+from typing import List, Literal, NewType, Optional, Union, cast
 
-import eth_utils
 import pydantic
 from eth_account.datastructures import SignedTransaction
-from pydantic.generics import GenericModel
+from eth_hash.auto import keccak
+
+from .exceptions import Web3APIError
+
+
+def _py_to_checksum_address(address: str) -> str:
+    """Return the EIP-55 checksum address of a hex address, with or without a "0x" prefix
+
+    This accepts the same strings as cchecksum and `eth_utils.to_checksum_address`, but only
+    strings, which makes it more than twice as fast as the latter.
+    """
+    hex_address = (address[2:] if address[:2] in ("0x", "0X") else address).lower()
+    try:
+        valid = len(hex_address) == 40 and len(bytes.fromhex(hex_address)) == 20
+    except ValueError:  # not hex
+        valid = False
+    if not valid:
+        raise ValueError(f"Unknown format {address!r}")
+    address_hash = keccak(hex_address.encode()).hex()
+    return "0x" + "".join([c if h < "8" else c.upper() for c, h in zip(hex_address, address_hash)])
+
+
+try:
+    from cchecksum import to_checksum_address as _to_checksum_address
+except ImportError:  # cchecksum is optional (Python 3.9+), but a lot faster
+    _to_checksum_address = _py_to_checksum_address  # type: ignore
+
 
 __all__ = [
     "Address",
     "Wei",
     "BlockParameter",
+    "BlockData",
+    "FullBlockData",
     "CallStateOverrideParams",
     "SignedTransaction",
     "TxHash",
@@ -20,13 +48,23 @@ __all__ = [
 
 
 class Address(str):
-    def __new__(cls, value) -> Address:
-        converted_value = value.lower()
-        return super().__new__(cls, converted_value)
+    # an Address is created for every address field of every parsed object; no per-instance dict
+    __slots__ = ()
+
+    def __new__(cls, value: str) -> Address:
+        lowered = value.lower()
+        if cls is not Address:
+            return str.__new__(cls, lowered)
+        address = _address_cache.get(lowered)
+        if address is None:
+            if len(_address_cache) >= _ADDRESS_CACHE_SIZE:
+                _address_cache.clear()
+            address = _address_cache[lowered] = str.__new__(cls, lowered)
+        return address
 
     def to_checksum_address(self) -> "ChecksumAddress":
         try:
-            converted = eth_utils.to_checksum_address(self)
+            converted = _to_checksum_address(self)
         except ValueError:
             raise ValueError(f"'{self}' is not a valid ETH address")
         return cast("ChecksumAddress", converted)
@@ -39,11 +77,71 @@ class Address(str):
         Note: An address has 20 Bytes (40 chars in hex form). A topic is 32 Bytes (64 chars in hex
         form). Thus we need to pad 24 zeros.
         """
-        return EventTopic(self[:2] + "0" * 24 + self[2:])
+        return _address_to_event_topic(self)
+
+
+# The same addresses show up over and over in parsed data (e.g. a token contract in every one of
+# its Transfer logs), so Address instances are shared. The cache is emptied when it gets too large.
+_address_cache: typing.Dict[str, Address] = {}
+_ADDRESS_CACHE_SIZE = 1 << 16
+
+_EVENT_TOPIC_PAD = "0x" + "0" * 24
+
+
+@functools.lru_cache(maxsize=4096)
+def _address_to_event_topic(address: str) -> EventTopic:
+    # the same addresses tend to be used in filters over and over, so the result is cached
+    return EventTopic(f"{_EVENT_TOPIC_PAD}{address[2:]}")
+
+
+def _quantity_to_int(v: typing.Any) -> typing.Any:
+    """Convert a hex-encoded quantity (e.g. "0x1f") into int"""
+    return int(v, 16) if isinstance(v, str) else v
+
+
+_F = typing.TypeVar("_F", bound=typing.Callable[..., typing.Any])
+
+
+def _from_rpc(func: _F) -> _F:
+    """Decorate a model constructor that skips pydantic validation of Web3 server data
+
+    Validation dominates the cost of parsing large responses, so these constructors only convert
+    the fields that need it. They should only be used for data coming from a trusted Web3 server.
+    Malformed data (e.g. a missing field) raises Web3APIError instead of pydantic's ValidationError.
+    """
+
+    @functools.wraps(func)
+    def wrapper(cls, data):
+        try:
+            return func(cls, data)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise Web3APIError(f"Malformed {cls.__name__} data from the Web3 server") from exc
+
+    return typing.cast(_F, wrapper)
+
+
+def _log_fields(log: typing.Mapping[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """Convert the fields of a log object returned by the Web3 server, for LogData"""
+    return {
+        "removed": log.get("removed", False),
+        "logIndex": _quantity_to_int(log["logIndex"]),
+        "transactionIndex": _quantity_to_int(log["transactionIndex"]),
+        "transactionHash": log["transactionHash"],
+        "blockHash": log["blockHash"],
+        "blockNumber": _quantity_to_int(log["blockNumber"]),
+        "address": Address(log["address"]),
+        "data": log["data"],
+        "topics": log["topics"],
+    }
+
+
+def _optional_address(v: typing.Any) -> typing.Any:
+    """Convert an address that may be `None` (e.g. the "to" of a contract creation) into Address"""
+    return Address(v) if v is not None else None
 
 
 ChecksumAddress = NewType("ChecksumAddress", Address)
-BlockParameter = Union[Literal["earlist", "latest", "pending"], int]
+BlockParameter = Union[Literal["earliest", "latest", "pending"], int]
 Wei = NewType("Wei", int)
 TxHash = NewType("TxHash", str)
 FilterId = NewType("FilterId", int)
@@ -120,14 +218,36 @@ class TxData(pydantic.BaseModel):
 
     @pydantic.validator("from_address", "to_address", pre=True)
     def str_to_address(cls, v):
-        if v is not None:
-            return Address(v)
+        if v is None or type(v) is Address:
+            return v
+        return Address(v)
 
     class Config:
         fields = {"from_address": "from", "to_address": "to"}
 
+    @classmethod
+    @_from_rpc
+    def from_rpc(cls, tx: typing.Mapping[str, typing.Any]) -> TxData:
+        """Build TxData from a transaction object returned by the Web3 server, without validation
 
-T = TypeVar("T", TxHash, TxData)
+        Pending transactions have no "blockHash", "blockNumber" or "transactionIndex".
+        """
+        return cls.construct(
+            blockHash=tx.get("blockHash"),
+            blockNumber=_quantity_to_int(tx.get("blockNumber")),
+            from_address=Address(tx["from"]),
+            gas=_quantity_to_int(tx["gas"]),
+            gasPrice=_quantity_to_int(tx["gasPrice"]),
+            hash=tx["hash"],
+            input=tx["input"],
+            nonce=_quantity_to_int(tx["nonce"]),
+            to_address=_optional_address(tx.get("to")),
+            transactionIndex=_quantity_to_int(tx.get("transactionIndex")),
+            value=_quantity_to_int(tx["value"]),
+            v=_quantity_to_int(tx["v"]),
+            r=tx["r"],
+            s=tx["s"],
+        )
 
 
 class NewHead(pydantic.BaseModel):
@@ -161,7 +281,9 @@ class NewHead(pydantic.BaseModel):
         return int(v, 16) if isinstance(v, str) else v
 
 
-class BlockData(GenericModel, Generic[T]):
+class _BlockBase(pydantic.BaseModel):
+    """Fields shared by BlockData and FullBlockData"""
+
     number: int
     hash: str
     parentHash: str
@@ -179,7 +301,6 @@ class BlockData(GenericModel, Generic[T]):
     gasLimit: int
     gasUsed: int
     timestamp: int
-    transactions: List[T]
     uncles: List[str]
 
     @pydantic.validator(
@@ -196,12 +317,20 @@ class BlockData(GenericModel, Generic[T]):
         return int(v, 16) if isinstance(v, str) else v
 
 
-# BlockData = GenericBlockData[str]
-# FullBlockData = GenericBlockData[TxData]
+class BlockData(_BlockBase):
+    """A block with the hashes of its transactions"""
+
+    transactions: List[TxHash]
+
+
+class FullBlockData(_BlockBase):
+    """A block with its full transactions"""
+
+    transactions: List[TxData]
 
 
 class LogData(pydantic.BaseModel):
-    removed: bool
+    removed: bool = False  # left out by some nodes
     logIndex: int
     transactionIndex: int
     transactionHash: str
@@ -217,7 +346,32 @@ class LogData(pydantic.BaseModel):
 
     @pydantic.validator("address", pre=True)
     def str_to_address(cls, v):
-        return Address(v)
+        return v if type(v) is Address else Address(v)
+
+    @classmethod
+    @_from_rpc
+    def from_rpc(cls, log: typing.Mapping[str, typing.Any]) -> LogData:
+        """Build LogData from a log object returned by the Web3 server, without validation"""
+        return cls.construct(**_log_fields(log))
+
+    @classmethod
+    @_from_rpc
+    def from_many(cls, logs: typing.Iterable[typing.Mapping[str, typing.Any]]) -> List[LogData]:
+        """Same as calling `from_rpc` on each log, but faster for large numbers of logs
+
+        The instances are set up the same way as `construct` does (`_log_fields` sets every field,
+        and LogData has no private attributes), without its per-call overhead.
+        """
+        new = cls.__new__
+        object_setattr = object.__setattr__
+        fields_set = set(cls.__fields__)
+        ret = []
+        for log in logs:
+            log_data = new(cls)
+            object_setattr(log_data, "__dict__", _log_fields(log))
+            object_setattr(log_data, "__fields_set__", fields_set.copy())
+            ret.append(log_data)
+        return ret
 
 
 class TxReceipt(pydantic.BaseModel):
@@ -268,8 +422,28 @@ class TxReceipt(pydantic.BaseModel):
 
     @pydantic.validator("from_address", "to_address", "contractAddress", pre=True)
     def str_to_address(cls, v):
-        if v is not None:
-            return Address(v)
+        if v is None or type(v) is Address:
+            return v
+        return Address(v)
 
     class Config:
         fields = {"from_address": "from", "to_address": "to"}
+
+    @classmethod
+    @_from_rpc
+    def from_rpc(cls, receipt: typing.Mapping[str, typing.Any]) -> TxReceipt:
+        """Build TxReceipt, and its logs, from a receipt returned by the Web3 server"""
+        return cls.construct(
+            transactionHash=receipt["transactionHash"],
+            transactionIndex=_quantity_to_int(receipt["transactionIndex"]),
+            blockHash=receipt["blockHash"],
+            blockNumber=_quantity_to_int(receipt["blockNumber"]),
+            from_address=Address(receipt["from"]),
+            to_address=_optional_address(receipt.get("to")),
+            cumulativeGasUsed=_quantity_to_int(receipt["cumulativeGasUsed"]),
+            gasUsed=_quantity_to_int(receipt["gasUsed"]),
+            contractAddress=_optional_address(receipt.get("contractAddress")),
+            logs=LogData.from_many(receipt["logs"]),
+            logsBloom=receipt["logsBloom"],
+            status=_quantity_to_int(receipt["status"]),
+        )
@@ -0,0 +1,39 @@
+import functools
+import re
+from typing import Iterable
+
+from eth_hash.auto import keccak
+
+# ABI type strings of one-word value types, e.g. "uint256", "int", "bytes32"
+INT_TYPE_RE = re.compile(r"(u?)int(\d*)")
+BYTES_TYPE_RE = re.compile(r"bytes(\d+)")
+
+
+def function_signature(name: str, types: Iterable[str]) -> str:
+    """Return the canonical signature of a function or event, e.g. "transfer(address,uint256)" """
+    return name + "(" + ",".join(types) + ")"
+
+
+@functools.lru_cache(maxsize=4096)
+def function_selector(signature: str) -> str:
+    """Return the 4-byte function selector of a function signature in hex string format
+
+    The selector is a pure function of the signature, so the result is cached.
+    """
+    return "0x" + keccak(signature.encode()).hex()[:8]
+
+
+@functools.lru_cache(maxsize=4096)
+def event_topic(signature: str) -> str:
+    """Return the 32-byte keccak hash of an event signature in hex string format
+
+    This is the "topic" that identifies the event in logs. The result is cached.
+    """
+    return "0x" + keccak(signature.encode()).hex()
+
+
+def hex_to_bytes(data: str) -> bytes:
+    """Convert a hex string, with or without the "0x" prefix, into bytes"""
+    if data[:2] == "0x":
+        return bytes.fromhex(data[2:])
+    return bytes.fromhex(data)
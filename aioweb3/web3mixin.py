@@ -1,17 +1,24 @@
+from contextvars import ContextVar, Token
 from typing import List, Optional
 
 from .aioweb3 import AioWeb3
 
 default_web3: Optional[AioWeb3] = None
 
+# The AioWeb3 set by the innermost `UseWeb3` block. A context variable (instead of a shared stack)
+# keeps concurrent tasks from seeing each other's `UseWeb3` blocks.
+_current_web3: ContextVar[Optional[AioWeb3]] = ContextVar("aioweb3_current_web3", default=None)
+
 
 class Web3Mixin:
-    _web3_stack: List[AioWeb3] = []
+    # empty, so that subclasses can use __slots__
+    __slots__ = ()
 
     @property
     def web3(self) -> AioWeb3:
-        if self._web3_stack:
-            return self._web3_stack[-1]
+        web3 = _current_web3.get()
+        if web3 is not None:
+            return web3
         else:
             assert default_web3 is not None
             return default_web3
@@ -20,12 +27,13 @@ class Web3Mixin:
 class UseWeb3:
     def __init__(self, web3: AioWeb3):
         self.web3 = web3
+        self._tokens: List[Token] = []
 
     def __enter__(self):
-        Web3Mixin._web3_stack.append(self.web3)
+        self._tokens.append(_current_web3.set(self.web3))
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        Web3Mixin._web3_stack.pop()
+        _current_web3.reset(self._tokens.pop())
 
 
 def set_default_web3(web3: AioWeb3):
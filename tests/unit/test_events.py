@@ -2,9 +2,11 @@ import json
 from collections import Counter
 from pathlib import Path
 
+import eth_abi
+import pytest
 from aioweb3 import commoncontracts as c
-from aioweb3.event import EventParser
-from aioweb3.types import LogData
+from aioweb3.event import EventParser, _encode_topic, _make_word_decoder
+from aioweb3.types import Address, LogData
 
 
 def test_can_parse_common_events():
@@ -33,3 +35,83 @@ def test_can_parse_common_events():
         "sender": "0x10ed43c718714eb63d5aa57b78b54704e256024e",
         "to": "0x91411a761431484f6fbaef3d9eea6d62d8f391c4",
     }
+
+
+def test_can_parse_raw_logs():
+    log_file = Path(__file__).resolve().parent / "logs.json"
+    with open(log_file, "rt") as f:
+        loaded = json.loads(f.read())
+
+    parser = EventParser([c.ERC20.Transfer, c.DEXPair.Swap, c.DEXPair.Sync])
+    all_parsed = list(parser.parse_logs_raw(loaded))
+    expected = list(parser.parse_logs([LogData(**log) for log in loaded]))
+    assert len(all_parsed) == 287
+    assert [p.fields for p in all_parsed] == [p.fields for p in expected]
+    assert [p.log for p in all_parsed] == [p.log for p in expected]
+
+
+@pytest.mark.parametrize(
+    "type_str, value",
+    [
+        ("uint256", 2**256 - 1),
+        ("uint112", 12345),
+        ("uint", 7),
+        ("int256", -(2**255)),
+        ("int24", -5),
+        ("address", "0x10ed43c718714eb63d5aa57b78b54704e256024e"),
+        ("bool", True),
+        ("bytes32", b"\x01" * 32),
+        ("bytes4", b"\x12\x34\x56\x78"),
+    ],
+)
+def test_word_decoder_matches_eth_abi(type_str, value):
+    word = eth_abi.encode_single(type_str, value)
+    decoder = _make_word_decoder(type_str)
+    assert decoder is not None
+    assert decoder(word) == eth_abi.decode_single(type_str, word) == value
+
+
+@pytest.mark.parametrize("type_str", ["uint8", "address", "bool", "bytes4"])
+def test_word_decoder_rejects_invalid_padding(type_str):
+    decoder = _make_word_decoder(type_str)
+    assert decoder is not None
+    with pytest.raises(ValueError):
+        decoder(b"\xff" * 32)
+
+
+@pytest.mark.parametrize("type_str", ["string", "bytes", "uint256[]", "(uint256,address)"])
+def test_word_decoder_not_available_for_dynamic_types(type_str):
+    assert _make_word_decoder(type_str) is None
+
+
+def test_make_topics():
+    address = Address("0x10ed43c718714eb63d5aa57b78b54704e256024e")
+    other = Address("0x91411a761431484f6fbaef3d9eea6d62d8f391c4")
+    signature_hash = c.ERC20.Transfer.get_event_topic()
+    assert c.ERC20.Transfer.topic_filter == [signature_hash]
+    assert c.ERC20.Transfer.make_topics() == [signature_hash]
+    assert c.ERC20.Transfer.make_topics(to=address) == [
+        signature_hash,
+        None,
+        address.to_event_topic(),
+    ]
+    assert c.ERC20.Transfer.make_topics(**{"from": [address, other]}) == [
+        signature_hash,
+        [address.to_event_topic(), other.to_event_topic()],
+    ]
+    with pytest.raises(ValueError):
+        c.ERC20.Transfer.make_topics(value=1)
+
+
+@pytest.mark.parametrize("type_str, value, other", [("int256", 1, True), ("bool", True, 1)])
+def test_encode_topic_does_not_confuse_bool_and_int(type_str, value, other):
+    assert _encode_topic(type_str, value) == "0x" + eth_abi.encode_single(type_str, value).hex()
+    with pytest.raises(eth_abi.exceptions.EncodingError):
+        _encode_topic(type_str, other)
+
+
+def test_encode_topic_accepts_unhashable_values():
+    assert _encode_topic("bytes", bytearray(b"\x12\x34")) == _encode_topic("bytes", b"\x12\x34")
+    assert _encode_topic("bytes32", bytearray(32)) == "0x" + "00" * 32
+    with pytest.raises(ValueError, match="not supported"):
+        _encode_topic("uint256[2]", [1, 2])
@@ -0,0 +1,83 @@
+import eth_abi
+import pytest
+from aioweb3 import commoncontracts as c
+from aioweb3.methodcall import MethodCall
+from aioweb3.utils import hex_to_bytes
+
+
+def test_MethodCall_precomputes_function_selector():
+    assert c.ERC20.transfer.function_signature == "transfer(address,uint256)"
+    assert c.ERC20.transfer.function_selector == "0xa9059cbb"
+    assert c.ERC20.balanceOf.function_selector == "0x70a08231"
+
+
+def test_MethodCall_encode_input():
+    data = c.ERC20.transfer.encode_input("0x18c2ccd3e937bb5b1560a6f70de9bdb1340d849d", 5)
+    assert data == (
+        "0xa9059cbb"
+        "00000000000000000000000018c2ccd3e937bb5b1560a6f70de9bdb1340d849d"
+        "0000000000000000000000000000000000000000000000000000000000000005"
+    )
+
+
+def test_MethodCall_equality_ignores_derived_fields():
+    assert MethodCall("decimals", [], ["uint8"]) == c.ERC20.decimals
+
+
+@pytest.mark.parametrize(
+    "input_types, args",
+    [
+        (["uint256"], (2**256 - 1,)),
+        (["int24"], (-5,)),
+        (["bool", "bytes4"], (True, b"\x12\x34")),
+        (["address", "uint256"], ("0x18c2ccd3e937bb5b1560a6f70de9bdb1340d849d", 5)),
+        # checksummed addresses and dynamic types go through eth_abi
+        (["address"], ("0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d",)),
+        (["uint256", "address[]"], (1, ["0x18c2ccd3e937bb5b1560a6f70de9bdb1340d849d"])),
+    ],
+)
+def test_MethodCall_encode_input_matches_eth_abi(input_types, args):
+    method = MethodCall("foo", input_types, [])
+    expected = method.function_selector + eth_abi.encode_abi(input_types, args).hex()
+    assert method.encode_input(*args) == expected
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (-1,),  # out of range
+        (True,),  # bool is not an uint
+        (1, 2),  # too many arguments
+    ],
+)
+def test_MethodCall_encode_input_raises_on_invalid_input(args):
+    with pytest.raises(Exception):
+        MethodCall("foo", ["uint8"], []).encode_input(*args)
+
+
+def test_MethodCall_encode_input_without_arguments():
+    assert c.ERC20.decimals.encode_input() == "0x313ce567"
+
+
+def test_MethodCall_bind_keeps_precomputed_selector():
+    address = "0x18c2ccd3e937bb5b1560a6f70de9bdb1340d849d"
+    bound = c.ERC20.balanceOf.bind(address)
+    assert bound.to == address
+    assert c.ERC20.balanceOf.to is None
+    assert bound.function_selector == c.ERC20.balanceOf.function_selector
+    assert bound.encode_input(address) == c.ERC20.balanceOf.encode_input(address)
+
+
+@pytest.mark.parametrize(
+    "output_types, values",
+    [
+        (["uint112", "uint112", "uint32"], (5, 6, 7)),
+        (["string"], ("foo",)),
+        (["address[]", "bool"], (("0x18c2ccd3e937bb5b1560a6f70de9bdb1340d849d",), True)),
+        ([], ()),
+    ],
+)
+def test_MethodCall_decode_output_matches_eth_abi(output_types, values):
+    data = "0x" + eth_abi.encode_abi(output_types, values).hex()
+    decoded = MethodCall("foo", [], output_types).decode_output(data)
+    assert decoded == eth_abi.decode_abi(output_types, hex_to_bytes(data)) == values
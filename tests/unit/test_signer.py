@@ -0,0 +1,208 @@
+import asyncio
+import time
+
+import pytest
+import rlp
+from aioweb3.exceptions import Web3APIError
+from aioweb3.signer import (
+    FailedToSendTransactionError,
+    Signer,
+    WaitForTransactionTimeoutError,
+)
+from aioweb3.transaction import Transaction
+from aioweb3.types import Address
+from aioweb3.web3mixin import UseWeb3
+from eth_account import Account
+
+PRIVATE_KEY = "0x" + "11" * 32
+WALLET_ADDRESS = Address(Account.from_key(PRIVATE_KEY).address)
+TO_ADDRESS = "0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d"  # checksummed, as eth_account requires
+
+
+class FakeWeb3:
+    """Mines sent transactions in nonce order on `mine()`; gas estimation fails for data "0xbad" """
+
+    def __init__(self, transaction_count: int = 0):
+        self.transaction_count = transaction_count
+        self.mempool: dict = {}  # nonce -> tx hash
+        self.receipts: dict = {}  # tx hash -> receipt
+        # False to act like a node behind on receipts (e.g. another node behind a load balancer)
+        self.receipts_visible = True
+        self.polls = 0
+
+    async def get_transaction_count(self, address, block="latest"):
+        return self.transaction_count
+
+    async def get_transaction_count_and_receipts(self, address, tx_hashes):
+        self.polls += 1
+        receipts = self.receipts if self.receipts_visible else {}
+        return self.transaction_count, [receipts.get(tx_hash) for tx_hash in tx_hashes]
+
+    async def estimate_gas(self, params, block="latest"):
+        await asyncio.sleep(0.01)
+        if params["data"] == "0xbad":
+            raise Web3APIError("execution reverted")
+        return 21000
+
+    async def send_signed_transaction(self, signed):
+        nonce = int.from_bytes(rlp.decode(signed.rawTransaction)[0], "big")
+        self.mempool[nonce] = signed.hash.hex()
+        return signed.hash.hex()
+
+    def mine(self):
+        while self.transaction_count in self.mempool:
+            tx_hash = self.mempool.pop(self.transaction_count)
+            self.receipts[tx_hash] = {"transactionHash": tx_hash}
+            self.transaction_count += 1
+
+
+def make_tx(data: str = "0x", with_gas: bool = True) -> Transaction:
+    params = {"to": TO_ADDRESS, "data": data, "gasPrice": 1, "chainId": 1, "value": 0}
+    if with_gas:
+        params["gas"] = 21000
+    return Transaction(params)  # type: ignore
+
+
+def make_signer() -> Signer:
+    # inside the event loop: on Python 3.8/3.9, the Signer's lock binds to the current loop
+    return Signer(WALLET_ADDRESS, PRIVATE_KEY, poll_interval=0.01, initial_poll_interval=0.01)
+
+
+def run(web3: FakeWeb3, coro):
+    async def main():
+        with UseWeb3(web3):  # type: ignore
+            return await coro()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_sends_get_distinct_nonces():
+    web3 = FakeWeb3(transaction_count=5)
+    txs = [make_tx() for _ in range(10)]
+
+    async def main():
+        signer = make_signer()
+        await asyncio.gather(*(signer.send_transaction(tx) for tx in txs))
+
+    run(web3, main)
+    assert sorted(tx.params["nonce"] for tx in txs) == list(range(5, 15))
+
+
+def test_failed_send_releases_nonce_for_next_send():
+    web3 = FakeWeb3()
+    # the first transaction estimates its gas, and fails only after the others were sent
+    bad, good1, good2 = make_tx("0xbad", with_gas=False), make_tx(), make_tx()
+
+    async def main():
+        signer = make_signer()
+        results = await asyncio.gather(
+            *(signer.send_transaction(tx) for tx in (bad, good1, good2)), return_exceptions=True
+        )
+        assert isinstance(results[0], FailedToSendTransactionError)
+        assert (good1.params["nonce"], good2.params["nonce"]) == (1, 2)
+        refill = make_tx()
+        await signer.send_transaction(refill)
+        assert refill.params["nonce"] == 0
+        web3.mine()
+        deadline = time.monotonic() + 1
+        await asyncio.gather(
+            *(signer.wait_for_transaction(tx, deadline) for tx in (good1, good2, refill))
+        )
+
+    run(web3, main)
+    assert web3.transaction_count == 3
+
+
+def test_released_nonce_below_mined_count_is_skipped():
+    web3 = FakeWeb3()
+
+    async def main():
+        signer = make_signer()
+        first, second = make_tx(), make_tx()
+        await signer.send_transaction(first)
+        await signer.send_transaction(second)
+        signer._release_nonce(0)  # e.g. a send that raised, but reached the node after all
+        signer._update_mined_transaction_count(1)
+        third = make_tx()
+        await signer.send_transaction(third)
+        assert third.params["nonce"] == 2
+
+    run(web3, main)
+
+
+def test_one_poll_resolves_several_waiters():
+    web3 = FakeWeb3()
+    txs = [make_tx() for _ in range(3)]
+
+    async def main():
+        signer = make_signer()
+        for tx in txs:
+            await signer.send_transaction(tx)
+        await asyncio.sleep(0.05)  # until the poller polls all three
+        polls = web3.polls
+        web3.mine()
+        await asyncio.gather(*(signer.wait_for_transaction(tx) for tx in txs))
+        assert web3.polls == polls + 1
+
+    run(web3, main)
+    assert all(tx.receipt is not None for tx in txs)
+
+
+def test_timeout_or_cancellation_of_one_waiter_does_not_affect_others():
+    web3 = FakeWeb3()
+    txs = [make_tx() for _ in range(3)]
+
+    async def main():
+        signer = make_signer()
+        for tx in txs:
+            await signer.send_transaction(tx)
+        timed_out = asyncio.create_task(signer.wait_for_transaction(txs[0], time.monotonic()))
+        cancelled = asyncio.create_task(signer.wait_for_transaction(txs[1]))
+        waiting = asyncio.create_task(signer.wait_for_transaction(txs[2]))
+        with pytest.raises(WaitForTransactionTimeoutError):
+            await timed_out
+        await asyncio.sleep(0.02)
+        cancelled.cancel()
+        web3.mine()
+        await asyncio.wait_for(waiting, 1)
+        assert txs[2].receipt is not None
+
+    run(web3, main)
+
+
+def test_missing_receipt_in_batch_whose_count_passed_the_nonce_is_not_dropped():
+    web3 = FakeWeb3()
+    tx = make_tx()
+
+    async def main():
+        signer = make_signer()
+        await signer.send_transaction(tx)
+        web3.receipts_visible = False
+        web3.mine()
+        waiting = asyncio.create_task(signer.wait_for_transaction(tx, time.monotonic() + 1))
+        while web3.polls < 1:
+            await asyncio.sleep(0.001)
+        web3.receipts_visible = True
+        await waiting
+
+    run(web3, main)
+    assert tx.receipt is not None
+
+
+def test_waiter_restarts_cancelled_poller():
+    web3 = FakeWeb3()
+    tx = make_tx()
+
+    async def main():
+        signer = make_signer()
+        await signer.send_transaction(tx)
+        waiting = asyncio.create_task(signer.wait_for_transaction(tx))
+        await asyncio.sleep(0.02)
+        assert signer._poller_task is not None
+        signer._poller_task.cancel()
+        await asyncio.sleep(0.02)
+        web3.mine()
+        await asyncio.wait_for(waiting, 1)
+
+    run(web3, main)
+    assert tx.receipt is not None
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from aioweb3.exceptions import Web3APIError, Web3TimeoutError
+from aioweb3.transport import (
+    HTTPTransport,
+    IPCTransport,
+    NotificationMessage,
+    PersistentSocket,
+    ResponseMessage,
+    Subscription,
+    TwoWayTransport,
+    _json_dumps,
+    _json_loads,
+)
+from aioweb3.types import Address
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"jsonrpc": "2.0", "method": "eth_chainId", "params": [], "id": 1},
+        [{"address": Address("0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d")}, None, True, 1.5],
+        {"value": 2**255},  # too large for orjson
+    ],
+)
+def test_json_dumps_matches_compact_json(obj):
+    assert _json_dumps(obj) == json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"jsonrpc":"2.0","id":1,"result":"0x38"}\n',
+        b'[{"jsonrpc":"2.0","id":1,"result":null},{"jsonrpc":"2.0","id":2,"error":{"code":-1}}]',
+        b'"\\ud800"',  # rejected by orjson
+        '{"jsonrpc":"2.0","id":1,"result":"0x38"}',  # text frame from a websocket
+    ],
+)
+def test_json_loads_matches_json(data):
+    assert _json_loads(data) == json.loads(data)
+
+
+@pytest.mark.parametrize(
+    "msg",
+    [
+        b'{"jsonrpc":"2.0","id":1,"result":"0x38"}',
+        b'{"jsonrpc":"2.0","id":2,"error":{"code":-32000,"message":"oops"}}',
+        b'{"jsonrpc":"2.0","id":"3","result":"0x1"}',  # validated (and coerced) by pydantic
+        b'{"jsonrpc":"2.0","method":"eth_subscription","params":{"subscription":"0xcd","result":{}}}',
+        '{"jsonrpc":"2.0","id":4,"result":"0x5"}',
+    ],
+)
+def test_parse_message_matches_validated_models(msg):
+    j = json.loads(msg)
+    expected = NotificationMessage(**j) if "method" in j else ResponseMessage(**j)
+    parsed = HTTPTransport("http://localhost")._parse_message(msg)
+    assert type(parsed) is type(expected)
+    assert parsed.dict() == expected.dict()
+
+
+@pytest.mark.parametrize(
+    "msg",
+    [
+        b'{"jsonrpc":"1.0","id":1,"result":"0x38"}',
+        b'{"jsonrpc":"2.0","id":null,"error":{"code":-32600}}',
+        b'{"jsonrpc":"2.0","method":"eth_subscription","params":{"result":{}}}',
+        b"not json",
+    ],
+)
+def test_parse_message_rejects_invalid_messages(msg):
+    with pytest.raises(Web3APIError):
+        HTTPTransport("http://localhost")._parse_message(msg)
+
+
+def test_full_subscription_drops_oldest_items():
+    async def run():
+        transport = IPCTransport("/tmp/does-not-exist.ipc")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=3)
+        transport._subscriptions["0xcd"] = queue
+        for i in range(5):
+            transport._handle_notification_message(
+                NotificationMessage(
+                    jsonrpc="2.0",
+                    method="eth_subscription",
+                    params={"subscription": "0xcd", "result": i},
+                )
+            )
+        subscription = Subscription("0xcd", queue)
+        assert await subscription.get_batch(max_items=2) == [2, 3]
+        assert await subscription.get_batch() == [4]
+
+    asyncio.run(run())
+
+
+def test_full_subscription_logs_once_when_dropping_starts_and_once_when_it_stops(caplog):
+    async def run():
+        transport = IPCTransport("/tmp/does-not-exist.ipc")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=3)
+        transport._subscriptions["0xcd"] = queue
+
+        def notify(i):
+            transport._handle_notification_message(
+                NotificationMessage(
+                    jsonrpc="2.0",
+                    method="eth_subscription",
+                    params={"subscription": "0xcd", "result": i},
+                )
+            )
+
+        for i in range(100):
+            notify(i)
+        assert caplog.messages == ["Subscription 0xcd is full; dropping the oldest items"]
+        queue.get_nowait()
+        notify(100)
+        assert caplog.messages[1:] == ["Subscription 0xcd caught up after dropping 97 items"]
+
+    asyncio.run(run())
+
+
+def test_transport_can_be_built_outside_event_loop():
+    errors = []
+
+    def build():
+        try:
+            IPCTransport("/tmp/does-not-exist.ipc")
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+    # a non-main thread has no event loop to bind to
+    thread = threading.Thread(target=build)
+    thread.start()
+    thread.join()
+    assert errors == []
+
+
+def test_cancelled_caller_does_not_abandon_connection_attempt(tmp_path):
+    ipc_path = str(tmp_path / "node.ipc")
+    connections = []
+
+    async def run():
+        server = await asyncio.start_unix_server(lambda r, w: connections.append(w), ipc_path)
+        socket = PersistentSocket(ipc_path)
+        first = asyncio.create_task(socket.ensure_connected())
+        await asyncio.sleep(0)  # let the connection attempt start
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        reader_writer = await socket.ensure_connected()
+        assert socket.reader_writer is reader_writer
+        await asyncio.sleep(0.1)
+        await socket.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+    assert len(connections) == 1
+
+
+@pytest.mark.parametrize("close_when", ["connecting", "connected", "stored"])
+def test_close_abandons_connection_attempt(tmp_path, close_when):
+    ipc_path = str(tmp_path / "node.ipc")
+    connections = []
+
+    async def run():
+        server = await asyncio.start_unix_server(lambda r, w: connections.append(r), ipc_path)
+        socket = PersistentSocket(ipc_path)
+        connecting = asyncio.create_task(socket.ensure_connected())
+        await asyncio.sleep(0)  # let the connection attempt start
+        if close_when == "connected":
+            # the attempt is over, but the connection is not stored yet
+            attempt = socket._connecting
+            while not attempt.done():
+                await asyncio.sleep(0)
+            assert socket.reader_writer is None
+        elif close_when == "stored":
+            await connecting
+        await socket.close()
+        await asyncio.gather(connecting, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        assert socket.reader_writer is None
+        for reader in connections:
+            assert await asyncio.wait_for(reader.read(), 1) == b""  # closed by the client
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+class SlowClosingTransport(TwoWayTransport):
+    """Answers requests from the second connection on; closing a connection takes 0.1 seconds"""
+
+    def __init__(self):
+        super().__init__("fake://node")
+        self.connections = 0
+        self.inbox: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, data: bytes):
+        request = json.loads(data)
+        if self.connections > 1:
+            response = _json_dumps({"jsonrpc": "2.0", "id": request["id"], "result": 1})
+            # answered after the old connection has finished closing
+            asyncio.get_running_loop().call_later(0.2, self.inbox.put_nowait, response)
+
+    async def receive(self) -> bytes:
+        self.connections += 1
+        self.listener.is_ready()
+        inbox = self.inbox = asyncio.Queue()
+        try:
+            return await inbox.get()
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.1)  # e.g. a WebSocket close handshake
+            raise
+
+    async def close(self):
+        await super().close()
+
+
+def test_request_after_timeout_is_answered_on_new_connection():
+    async def run():
+        transport = SlowClosingTransport()
+        with pytest.raises(Web3TimeoutError):
+            await transport.send_request("eth_blockNumber", timeout=0.01)
+        # sent on a new connection while the old one is still closing
+        assert await transport.send_request("eth_blockNumber", timeout=1) == 1
+        await transport.close()
+
+    asyncio.run(run())
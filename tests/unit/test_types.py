@@ -1,5 +1,10 @@
+import json
+from pathlib import Path
+
+import eth_utils
 import pytest
 from aioweb3 import types
+from aioweb3.exceptions import Web3APIError
 
 
 def test_Address_convert_to_lower_case():
@@ -14,6 +19,16 @@ def test_Address_type():
     assert isinstance(address, str)
 
 
+def test_Address_instances_are_shared():
+    address_str = "0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d"
+    assert types.Address(address_str) is types.Address(address_str.lower())
+
+    class SubAddress(types.Address):
+        pass
+
+    assert type(SubAddress(address_str)) is SubAddress
+
+
 def test_Address_to_checksum_address():
     address_str = "0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d"
     checksum_address = types.Address(address_str).to_checksum_address()
@@ -21,12 +36,58 @@ def test_Address_to_checksum_address():
     assert checksum_address == address_str
 
 
+@pytest.mark.parametrize(
+    "address",
+    [
+        "0x0000000000000000000000000000000000000000",
+        "0xffffffffffffffffffffffffffffffffffffffff",
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339ce",
+        "0x547A355e70cd1f8caf531b950905af751dbef5e6",
+    ],
+)
+def test_Address_to_checksum_address_matches_eth_utils(address):
+    assert types.Address(address).to_checksum_address() == eth_utils.to_checksum_address(address)
+
+
 def test_Address_to_checksum_address_raises_on_incorrect_address():
     address = "0x18C2ccD3e937bb5b1560A6f70DE9bDB1340D849d"
     with pytest.raises(ValueError):
         types.Address(address[:-1]).to_checksum_address()
 
 
+@pytest.mark.parametrize(
+    "address",
+    [
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339ce",
+        "eba0de32fddb36751a83ac4a10ab0fa9a6f339ce",  # unprefixed
+        "0XEBA0DE32FDDB36751A83AC4A10AB0FA9A6F339CE",
+        "0x547A355e70cd1f8caf531b950905af751dbef5e6",  # mixed case, not a valid checksum
+        "547A355e70cd1f8caf531b950905af751dbef5e6",
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339c",  # too short
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339cea",  # odd length
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339ceab",  # too long
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339cg",  # not hex
+        "0x0xba0de32fddb36751a83ac4a10ab0fa9a6f339ce",  # prefixed twice
+        "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339c ",
+        " eba0de32fddb36751a83ac4a10ab0fa9a6f339ce",
+        "",
+    ],
+)
+@pytest.mark.parametrize("reference", ["eth_utils", "cchecksum"])
+def test_py_to_checksum_address_matches_reference(address, reference):
+    to_checksum_address = pytest.importorskip(reference).to_checksum_address
+
+    def checksum_or_error(func):
+        try:
+            return func(address)
+        except ValueError:
+            return ValueError
+
+    assert checksum_or_error(types._py_to_checksum_address) == checksum_or_error(
+        to_checksum_address
+    )
+
+
 def test_LogData_parses_address():
     data = {
         "address": "0x547a355e70cd1f8caf531b950905af751dbef5e6",
@@ -43,6 +104,109 @@ def test_LogData_parses_address():
     assert type(parsed.address) == types.Address
 
 
+LOG_DATA = {
+    "address": "0x547A355e70cd1f8caf531b950905af751dbef5e6",
+    "blockHash": "0xbe8888feb5f2924967b40cd024d2e88138b6c096371abe4f9a739b742eaf0674",
+    "blockNumber": "0x93e02f",
+    "data": "0x0000000000000000000000000000000000000000006c97c7265005587d9adae300000000000000000000000000000000000000000000013495768fe4bbc0f1ef",
+    "logIndex": "0x4",
+    "removed": False,
+    "topics": ["0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"],
+    "transactionHash": "0xcf804a5b1b45e29d4ddfa6edb16381ce07d9de1044e9d6d62a1737d6c9565abf",
+    "transactionIndex": "0x0",
+}
+
+
+# a contract creation, with "to" set to null
+TX_DATA = {
+    "blockHash": "0x1d59ff54b1eb26b013ce3cb5fc9dab3705b415a67127a003c3e61eb445bb8df2",
+    "blockNumber": "0x5daf3b",
+    "from": "0xa7d9ddbe1f17865597fbd27ec712455208b6b76d",
+    "gas": "0xc350",
+    "gasPrice": "0x4a817c800",
+    "hash": "0x88df016429689c079f3b2f6ad39fa052532c56795b733da78a91ebe6a713944b",
+    "input": "0x68656c6c6f21",
+    "nonce": "0x15",
+    "to": None,
+    "transactionIndex": "0x41",
+    "value": "0xf3dbb76162000",
+    "v": "0x25",
+    "r": "0x1b5e176d927f8e9ab405058b2d2457392da3e20f328b16ddabcebc33eaac5fea",
+    "s": "0x4ba69724e8f69de52f0125ad8b3c5c2cef33019bac3249e2c0a2192766d1721c",
+}
+
+
+RECEIPT_DATA = {
+    "blockHash": "0xc7316bf1631a01df297ac8540f0ec159593bb856a52b289290313cdce679b1a9",
+    "blockNumber": "0xa8b319",
+    "contractAddress": None,
+    "cumulativeGasUsed": "0xa09c7",
+    "from": "0xeba0de32fddb36751a83ac4a10ab0fa9a6f339ce",
+    "gasUsed": "0x5208",
+    "logs": json.loads((Path(__file__).parent / "logs.json").read_text())[:3],
+    "logsBloom": "0x" + "00" * 256,
+    "status": "0x1",
+    "to": "0x0678aa21a3485eed7e9bdfb802d620ea8efff860",
+    "transactionHash": "0xdecc513528b35a17dd76b7f776f7977a8a5c93f67ee89dd9c77936591c636908",
+    "transactionIndex": "0x4",
+    "type": "0x0",
+}
+
+
+@pytest.mark.parametrize(
+    "model, data",
+    [
+        (types.LogData, LOG_DATA),
+        (types.LogData, {k: v for k, v in LOG_DATA.items() if k != "removed"}),
+        (types.TxData, TX_DATA),
+        (types.TxReceipt, RECEIPT_DATA),
+    ],
+)
+def test_from_rpc_matches_parse_obj(model, data):
+    assert model.from_rpc(data) == model.parse_obj(data)
+
+
+@pytest.mark.parametrize(
+    "model, data, missing_field",
+    [
+        (types.LogData, LOG_DATA, "logIndex"),
+        (types.TxData, TX_DATA, "hash"),
+        (types.TxReceipt, RECEIPT_DATA, "gasUsed"),
+    ],
+)
+def test_from_rpc_raises_Web3APIError_on_missing_field(model, data, missing_field):
+    data = {k: v for k, v in data.items() if k != missing_field}
+    with pytest.raises(Web3APIError):
+        model.from_rpc(data)
+
+
+def test_LogData_from_rpc_converts_fields():
+    parsed = types.LogData.from_rpc(LOG_DATA)
+    assert type(parsed.address) == types.Address
+    assert parsed.blockNumber == 0x93E02F
+
+
+LOGS = json.loads((Path(__file__).parent / "logs.json").read_text())
+
+
+@pytest.mark.parametrize(
+    "logs",
+    [LOGS, [{k: v for k, v in log.items() if k != "removed"} for log in LOGS[:3]]],
+)
+def test_LogData_from_many_matches_from_rpc_and_parse_obj(logs):
+    parsed = types.LogData.from_many(logs)
+    assert parsed == [types.LogData.from_rpc(log) for log in logs]
+    assert parsed == [types.LogData.parse_obj(log) for log in logs]
+
+
+@pytest.mark.parametrize("missing_field", ["logIndex", "blockHash", "address", "topics"])
+def test_LogData_from_many_raises_Web3APIError_on_missing_field(missing_field):
+    logs = LOGS[:3]
+    logs[-1] = {k: v for k, v in logs[-1].items() if k != missing_field}
+    with pytest.raises(Web3APIError):
+        types.LogData.from_many(logs)
+
+
 def test_TxData_can_parse():
     data = {
         "blockHash": "0x1d59ff54b1eb26b013ce3cb5fc9dab3705b415a67127a003c3e61eb445bb8df2",